@@ -12,20 +12,40 @@ import logging
 import os
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Repository root, resolved once at import
+BASE_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Add parent directory to path for shared_server imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from shared_server.client import is_app_running
+sys.path.insert(0, str(BASE_DIR))
+from shared_server.client import is_app_running, READY_FD_ENV
 
 logger = logging.getLogger(__name__)
 
+# Last time each app was seen running, so bursts of tool calls skip the probe
+RUNNING_TTL = 0.5  # seconds
+_running_cache: Dict[str, float] = {}
+
+
+def _cached_is_running(app_name: str, ttl: float = RUNNING_TTL) -> bool:
+    """``is_app_running`` with positive results cached for ``ttl`` seconds."""
+    now = time.monotonic()
+    if now - _running_cache.get(app_name, float('-inf')) < ttl:
+        return True
+    if is_app_running(app_name):
+        _running_cache[app_name] = now
+        return True
+    _running_cache.pop(app_name, None)
+    return False
+
 class AppLauncher:
     """Utility class for launching GUI applications when needed."""
     
     def __init__(self):
-        self.base_dir = Path(__file__).parent.parent  # repository root
+        self.base_dir = BASE_DIR  # repository root
         
         # Application configurations
         self.app_configs = {
@@ -48,6 +68,14 @@ class AppLauncher:
                 'max_retries': 3
             }
         }
+        
+        # Resolve script paths once instead of on every launch
+        for config in self.app_configs.values():
+            config['script_path'] = self.base_dir / config['script']
+        
+        # In-flight launches, so concurrent callers (e.g. a prewarm and the
+        # first tool call) wait on the same launch instead of starting two
+        self._launches: Dict[str, asyncio.Future] = {}
     
     async def ensure_app_running(self, app_name: str) -> Dict[str, Any]:
         """Ensure the specified application is running, launching it if necessary.
@@ -68,8 +96,8 @@ class AppLauncher:
         config = self.app_configs[app_name]
         
         # Check if app is already running
-        if is_app_running(app_name):
-            logger.info(f"{config['name']} is already running")
+        if _cached_is_running(app_name):
+            logger.info("%s is already running", config['name'])
             return {
                 'success': True,
                 'message': f"{config['name']} is already running",
@@ -77,19 +105,34 @@ class AppLauncher:
                 'launched': False
             }
         
-        # Launch the application
-        logger.info(f"Launching {config['name']}...")
+        # Launch the application, or join a launch that is already under way
+        launch = self._launches.get(app_name)
+        if launch is None:
+            launch = asyncio.ensure_future(self._launch_and_record(app_name, config))
+            self._launches[app_name] = launch
+            launch.add_done_callback(lambda _: self._launches.pop(app_name, None))
+        return await asyncio.shield(launch)
+    
+    async def _launch_and_record(self, app_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Launch an app and update the running cache with the outcome."""
+        logger.info("Launching %s...", config['name'])
         try:
             result = await self._launch_app(app_name, config)
-            return result
         except Exception as e:
-            logger.error(f"Failed to launch {config['name']}: {e}")
+            _running_cache.pop(app_name, None)
+            logger.error("Failed to launch %s: %s", config['name'], e)
             return {
                 'success': False,
                 'error': f"Failed to launch {config['name']}: {str(e)}",
                 'app_name': app_name,
                 'launched': False
             }
+        
+        if result['success']:
+            _running_cache[app_name] = time.monotonic()
+        else:
+            _running_cache.pop(app_name, None)
+        return result
     
     async def _launch_app(self, app_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """Launch the specified application.
@@ -101,7 +144,7 @@ class AppLauncher:
         Returns:
             Dict with launch result
         """
-        script_path = self.base_dir / config['script']
+        script_path = config['script_path']
         
         if not script_path.exists():
             return {
@@ -111,41 +154,52 @@ class AppLauncher:
                 'launched': False
             }
         
-        # Launch the application in the background
+        # Launch the application in the background. On POSIX the child gets the
+        # write end of a pipe; the shared server writes one byte to it once the
+        # app is listening, and the pipe reaches EOF if the child dies first.
+        ready_r = ready_w = None
+        popen_kwargs: Dict[str, Any] = {}
+        if os.name == 'posix':
+            ready_r, ready_w = os.pipe()
+            popen_kwargs['pass_fds'] = (ready_w,)
+            popen_kwargs['env'] = {**os.environ, READY_FD_ENV: str(ready_w)}
+        
         try:
-            # Use subprocess.Popen to launch without blocking
-            process = subprocess.Popen(
-                [sys.executable, str(script_path)],
-                cwd=str(script_path.parent),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                start_new_session=True  # Detach from parent process
-            )
-            
-            logger.info(f"Launched {config['name']} with PID {process.pid}")
+            try:
+                # Use subprocess.Popen to launch without blocking. Keep this free
+                # of preexec_fn/user/group options: without them CPython spawns
+                # via vfork on Linux, so launch cost doesn't grow with our RSS.
+                process = subprocess.Popen(
+                    [sys.executable, str(script_path)],
+                    cwd=str(script_path.parent),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,  # Detach from parent process
+                    **popen_kwargs
+                )
+            finally:
+                if ready_w is not None:
+                    os.close(ready_w)
             
-            # Wait for the application to start and register with shared server
-            await asyncio.sleep(config['check_delay'])
+            logger.info("Launched %s with PID %s", config['name'], process.pid)
             
-            # Check if the application is now running
-            retries = 0
             max_retries = config['max_retries']
+            if ready_r is not None:
+                timeout = config['check_delay'] + max_retries
+                fd, ready_r = ready_r, None
+                registered = await self._wait_for_ready(app_name, fd, timeout)
+            else:
+                registered = await self._poll_until_running(app_name, config)
             
-            while retries < max_retries:
-                if is_app_running(app_name):
-                    logger.info(f"{config['name']} successfully started and registered")
-                    return {
-                        'success': True,
-                        'message': f"{config['name']} launched successfully",
-                        'app_name': app_name,
-                        'launched': True,
-                        'pid': process.pid
-                    }
-                
-                retries += 1
-                if retries < max_retries:
-                    logger.info(f"Waiting for {config['name']} to register... (attempt {retries + 1}/{max_retries})")
-                    await asyncio.sleep(1.0)
+            if registered:
+                logger.info("%s successfully started and registered", config['name'])
+                return {
+                    'success': True,
+                    'message': f"{config['name']} launched successfully",
+                    'app_name': app_name,
+                    'launched': True,
+                    'pid': process.pid
+                }
             
             # Application launched but didn't register properly
             return {
@@ -163,6 +217,62 @@ class AppLauncher:
                 'app_name': app_name,
                 'launched': False
             }
+        finally:
+            if ready_r is not None:
+                os.close(ready_r)
+    
+    async def _wait_for_ready(self, app_name: str, fd: int, timeout: float) -> bool:
+        """Wait for the readiness byte on ``fd``, then close it.
+        
+        Returns as soon as the app signals it is listening, or as soon as the
+        pipe hits EOF (the child exited without registering). A periodic
+        ``is_app_running`` check covers apps that don't signal readiness.
+        """
+        loop = asyncio.get_running_loop()
+        signalled = loop.create_future()
+        
+        def on_readable():
+            try:
+                data = os.read(fd, 1)
+            except OSError:
+                data = b''
+            loop.remove_reader(fd)
+            if not signalled.done():
+                signalled.set_result(bool(data))
+        
+        loop.add_reader(fd, on_readable)
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return is_app_running(app_name)
+                try:
+                    ready = await asyncio.wait_for(asyncio.shield(signalled), min(1.0, remaining))
+                except asyncio.TimeoutError:
+                    if is_app_running(app_name):
+                        return True
+                    continue
+                # EOF means the child (and any descendants) closed the pipe
+                return ready or is_app_running(app_name)
+        finally:
+            loop.remove_reader(fd)
+            os.close(fd)
+    
+    async def _poll_until_running(self, app_name: str, config: Dict[str, Any]) -> bool:
+        """Poll ``is_app_running`` until the app registers or retries run out."""
+        await asyncio.sleep(config['check_delay'])
+        
+        retries = 0
+        max_retries = config['max_retries']
+        while retries < max_retries:
+            if is_app_running(app_name):
+                return True
+            retries += 1
+            if retries < max_retries:
+                logger.info("Waiting for %s to register... (attempt %s/%s)", config['name'], retries + 1, max_retries)
+                await asyncio.sleep(1.0)
+        return False
 
 # Global instance for easy access
 app_launcher = AppLauncher()
@@ -178,4 +288,41 @@ async def ensure_radio_player_running() -> Dict[str, Any]:
 
 async def ensure_word_editor_running() -> Dict[str, Any]:
     """Ensure word editor application is running."""
-    return await app_launcher.ensure_app_running('word_editor')
\ No newline at end of file
+    return await app_launcher.ensure_app_running('word_editor')
+
+
+def install_uvloop() -> bool:
+    """Make uvloop the asyncio event loop if it is installed.
+    
+    Call before ``mcp.run()``; FastMCP creates its loop through the default
+    policy, so every pipe and socket read afterwards goes through libuv.
+    Returns whether uvloop is in use.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
+
+
+def start_prewarm(*app_names: str) -> Optional[asyncio.Task]:
+    """Start launching ``app_names`` in the background if MCP_PREWARM=1.
+    
+    Meant to be called from an MCP server's lifespan so the app is usually
+    registered by the time the first tool call arrives. Returns the task,
+    or None when prewarming is disabled.
+    """
+    if os.environ.get('MCP_PREWARM') != '1':
+        return None
+    
+    async def prewarm():
+        results = await asyncio.gather(
+            *(app_launcher.ensure_app_running(name) for name in app_names)
+        )
+        for result in results:
+            if not result['success']:
+                logger.warning("Prewarm of %s failed: %s", result['app_name'], result.get('error'))
+    
+    logger.info("Prewarming %s", ', '.join(app_names))
+    return asyncio.ensure_future(prewarm())
@@ -1,8 +1,22 @@
 """Handlers package for Browser MCP server."""
 
-from handlers.navigation_handler import NavigationHandler
-from handlers.bookmark_handler import BookmarkHandler
-from handlers.page_handler import PageHandler
-from handlers.adblock_handler import AdblockHandler
+import importlib
 
-__all__ = ["NavigationHandler", "BookmarkHandler", "PageHandler", "AdblockHandler"]
\ No newline at end of file
+# Handler classes are imported on first access, so importing one handler
+# module doesn't load the other three
+_LAZY = {
+    "NavigationHandler": "handlers.navigation_handler",
+    "BookmarkHandler": "handlers.bookmark_handler",
+    "PageHandler": "handlers.page_handler",
+    "AdblockHandler": "handlers.adblock_handler",
+}
+
+__all__ = ["NavigationHandler", "BookmarkHandler", "PageHandler", "AdblockHandler"]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        handler_class = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = handler_class
+        return handler_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
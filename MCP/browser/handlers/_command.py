@@ -0,0 +1,61 @@
+"""Shared browser command channel for Browser MCP handlers."""
+
+import os
+import sys
+from typing import Dict, Any, Optional
+from utils.logger import setup_logger
+
+# Repository root, computed once so shared_server is importable from the MCP server
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, BASE_PATH)
+from shared_server.client import get_async_client
+
+logger = setup_logger(__name__)
+
+# Commands that only read browser state; anything else may change the page
+READ_ONLY_COMMANDS = frozenset({"get_html_sync", "summarize", "bookmarks_json", "adblock_status"})
+
+# Bumped whenever a command that may change the page is sent, so callers
+# caching page data can tell when it went stale
+_state_version = 0
+
+def state_version() -> int:
+    """Return the current page-state version."""
+    return _state_version
+
+async def run_command(command: str, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Send a command to the browser app over the shared_server connection."""
+    global _state_version
+    if command not in READ_ONLY_COMMANDS:
+        _state_version += 1
+    
+    try:
+        logger.info("Sending command: %s %s", command, args or {})
+        
+        response = await get_async_client("browser").send_command(command, args)
+        
+        if response.get("status") == "success":
+            logger.info("Command successful: %s", response.get("message", ""))
+            result = {
+                "success": True,
+                "output": response.get("message", ""),
+                "command": command
+            }
+            if "data" in response:
+                result["data"] = response["data"]
+            return result
+        else:
+            logger.error("Command failed: %s", response.get("message", ""))
+            return {
+                "success": False,
+                "error": response.get("message", "Command failed"),
+                "command": command
+            }
+            
+    except Exception as e:
+        logger.error("Failed to run command %s: %s", command, e)
+        return {
+            "success": False,
+            "error": str(e),
+            "command": command
+        }
@@ -1,102 +1,52 @@
 """Adblock operations handler for Browser MCP server."""
 
-import asyncio
 from typing import Dict, Any, Optional
 from utils.logger import setup_logger
+from handlers._command import run_command
 
 logger = setup_logger(__name__)
 
 class AdblockHandler:
     """Handles adblock operations for the browser."""
     
-    def __init__(self):
-        self.base_command = [
-            "python", "-m", "shared_server.cli", "send", "browser"
-        ]
+    # Simple toggles: method key -> (app command, reported operation)
+    _OPERATIONS = {
+        "enable": ("adblock_enable", "enable_adblock"),
+        "disable": ("adblock_disable", "disable_adblock"),
+        "toggle": ("adblock_toggle", "toggle_adblock"),
+    }
     
-    def _get_base_path(self):
-        """Get the base path dynamically - go up 3 levels from MCP/browser/handlers/"""
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        return os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-    
-    async def _run_command(self, command_args: list) -> Dict[str, Any]:
-        """Run a shared_server CLI command for browser operations."""
-        try:
-            full_command = self.base_command + command_args
-            logger.info(f"Running command: {' '.join(full_command)}")
-            
-            # Run the command
-            process = await asyncio.create_subprocess_exec(
-                *full_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self._get_base_path()
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            stdout_text = stdout.decode().strip()
-            stderr_text = stderr.decode().strip()
-            
-            if process.returncode == 0:
-                logger.info(f"Command successful: {stdout_text}")
-                return {
-                    "success": True,
-                    "output": stdout_text,
-                    "command": command_args
-                }
-            else:
-                logger.error(f"Command failed: {stderr_text}")
-                return {
-                    "success": False,
-                    "error": stderr_text,
-                    "output": stdout_text,
-                    "command": command_args,
-                    "return_code": process.returncode
-                }
-                
-        except Exception as e:
-            logger.error(f"Failed to run command {command_args}: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "command": command_args
-            }
+    async def _op(self, key: str) -> Dict[str, Any]:
+        """Run one of the argument-less adblock commands."""
+        command, operation = self._OPERATIONS[key]
+        result = await run_command(command)
+        result["operation"] = operation
+        return result
     
     async def enable_adblock(self) -> Dict[str, Any]:
         """Enable adblock functionality."""
-        result = await self._run_command(["adblock_enable"])
-        result["operation"] = "enable_adblock"
-        
-        return result
+        return await self._op("enable")
     
     async def disable_adblock(self) -> Dict[str, Any]:
         """Disable adblock functionality."""
-        result = await self._run_command(["adblock_disable"])
-        result["operation"] = "disable_adblock"
-        
-        return result
+        return await self._op("disable")
     
     async def toggle_adblock(self) -> Dict[str, Any]:
         """Toggle adblock on/off."""
-        result = await self._run_command(["adblock_toggle"])
-        result["operation"] = "toggle_adblock"
-        
-        return result
+        return await self._op("toggle")
     
     async def get_status(self) -> Dict[str, Any]:
         """Get current adblock status."""
-        result = await self._run_command(["adblock_status"])
+        result = await run_command("adblock_status")
         result["operation"] = "get_adblock_status"
         
         if result["success"]:
-            # Parse status from output
-            output = result["output"].lower()
-            if "enabled" in output:
+            # Read status from the filter state reported by the app
+            active = (result.get("data") or {}).get("active")
+            if active is True:
                 result["adblock_enabled"] = True
                 result["status"] = "enabled"
-            elif "disabled" in output:
+            elif active is False:
                 result["adblock_enabled"] = False
                 result["status"] = "disabled"
             else:
@@ -114,12 +64,9 @@ class AdblockHandler:
                 "operation": "load_adblock_rules"
             }
         
-        if is_directory:
-            command_args = ["adblock_load_dir", f"path={path}"]
-        else:
-            command_args = ["adblock_load", f"path={path}"]
+        command = "adblock_load_dir" if is_directory else "adblock_load"
         
-        result = await self._run_command(command_args)
+        result = await run_command(command, {"path": path})
         result["operation"] = "load_adblock_rules"
         result["path"] = path
         result["is_directory"] = is_directory
@@ -128,12 +75,12 @@ class AdblockHandler:
     
     async def fetch_easylist(self, url: Optional[str] = None) -> Dict[str, Any]:
         """Download and load EasyList rules."""
-        command_args = ["adblock_fetch_easylist"]
+        command_args = {}
         
         if url:
-            command_args.append(f"url={url}")
+            command_args["url"] = url
         
-        result = await self._run_command(command_args)
+        result = await run_command("adblock_fetch_easylist", command_args)
         result["operation"] = "fetch_easylist"
         
         if url:
@@ -1,81 +1,36 @@
 """Bookmark operations handler for Browser MCP server."""
 
-import asyncio
-import json
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from utils.logger import setup_logger
+from handlers._command import run_command
 
 logger = setup_logger(__name__)
 
+# Bookmarks can also be added in the browser itself or by another client,
+# so a search reloads them once the last load is older than this
+SEARCH_INDEX_TTL = 5.0  # seconds
+
 class BookmarkHandler:
     """Handles bookmark operations for the browser."""
     
     def __init__(self):
-        self.base_command = [
-            "python", "-m", "shared_server.cli", "send", "browser"
-        ]
-    
-    def _get_base_path(self):
-        """Get the base path dynamically - go up 3 levels from MCP/browser/handlers/"""
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        return os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-    
-    async def _run_command(self, command_args: list) -> Dict[str, Any]:
-        """Run a shared_server CLI command for browser operations."""
-        try:
-            full_command = self.base_command + command_args
-            logger.info(f"Running command: {' '.join(full_command)}")
-            
-            # Run the command
-            process = await asyncio.create_subprocess_exec(
-                *full_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self._get_base_path()
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            stdout_text = stdout.decode().strip()
-            stderr_text = stderr.decode().strip()
-            
-            if process.returncode == 0:
-                logger.info(f"Command successful: {stdout_text}")
-                return {
-                    "success": True,
-                    "output": stdout_text,
-                    "command": command_args
-                }
-            else:
-                logger.error(f"Command failed: {stderr_text}")
-                return {
-                    "success": False,
-                    "error": stderr_text,
-                    "output": stdout_text,
-                    "command": command_args,
-                    "return_code": process.returncode
-                }
-                
-        except Exception as e:
-            logger.error(f"Failed to run command {command_args}: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "command": command_args
-            }
+        # Lowercased (name, url, bookmark) tuples from the last bookmark load
+        self._search_index: Optional[List[Tuple[str, str, Dict[str, Any]]]] = None
+        self._search_index_loaded = 0.0
     
     async def add_bookmark(self, url: Optional[str] = None, name: Optional[str] = None) -> Dict[str, Any]:
         """Add a bookmark for the current page or specified URL."""
-        command_args = ["bookmark_add"]
+        command_args = {}
         
         if url:
-            command_args.append(f"url={url}")
+            command_args["url"] = url
         
         if name:
-            command_args.append(f"name={name}")
+            command_args["name"] = name
         
-        result = await self._run_command(command_args)
+        result = await run_command("bookmark_add", command_args)
+        self._search_index = None
         result["operation"] = "add_bookmark"
         
         if url:
@@ -87,22 +42,31 @@ class BookmarkHandler:
     
     async def get_bookmarks(self) -> Dict[str, Any]:
         """Get all bookmarks as JSON."""
-        result = await self._run_command(["bookmarks_json"])
+        result = await run_command("bookmarks_json")
         result["operation"] = "get_bookmarks"
         
         if result["success"]:
-            try:
-                # Parse the JSON output to validate it
-                bookmarks_data = json.loads(result["output"])
-                result["bookmarks"] = bookmarks_data
-                result["bookmark_count"] = len(bookmarks_data) if isinstance(bookmarks_data, list) else 0
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse bookmarks JSON: {e}")
-                result["raw_output"] = result["output"]
-                result["parse_error"] = str(e)
+            # The app returns the bookmark list already decoded in the response data
+            bookmarks_data = (result.get("data") or {}).get("bookmarks", [])
+            result["bookmarks"] = bookmarks_data
+            self._search_index = self._build_search_index(bookmarks_data)
+            self._search_index_loaded = time.monotonic()
+            result["bookmark_count"] = len(self._search_index)
         
         return result
     
+    @staticmethod
+    def _build_search_index(bookmarks: Any) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Lowercase bookmark names and URLs once so searches don't redo it."""
+        # The app serializes Bookmark dataclasses, so one check of the
+        # container is enough; entries are always name/url dicts.
+        if type(bookmarks) is not list:
+            return []
+        return [
+            (bookmark["name"].lower(), bookmark["url"].lower(), bookmark)
+            for bookmark in bookmarks
+        ]
+    
     async def remove_bookmark(self, url: str) -> Dict[str, Any]:
         """Remove a bookmark by URL."""
         # This functionality would need to be implemented in the browser app
@@ -116,31 +80,26 @@ class BookmarkHandler:
     
     async def search_bookmarks(self, query: str) -> Dict[str, Any]:
         """Search bookmarks by name or URL."""
-        # Get all bookmarks first
-        bookmarks_result = await self.get_bookmarks()
-        
-        if not bookmarks_result["success"]:
-            return {
-                "success": False,
-                "error": "Failed to retrieve bookmarks for search",
-                "operation": "search_bookmarks",
-                "query": query
-            }
+        # Reuse the index from a recent load, otherwise reload the bookmarks
+        if (self._search_index is None
+                or time.monotonic() - self._search_index_loaded >= SEARCH_INDEX_TTL):
+            bookmarks_result = await self.get_bookmarks()
+            
+            if not bookmarks_result["success"]:
+                return {
+                    "success": False,
+                    "error": "Failed to retrieve bookmarks for search",
+                    "operation": "search_bookmarks",
+                    "query": query
+                }
         
         try:
-            bookmarks = bookmarks_result.get("bookmarks", [])
-            
             # Filter bookmarks based on query
-            matching_bookmarks = []
             query_lower = query.lower()
-            
-            for bookmark in bookmarks:
-                if isinstance(bookmark, dict):
-                    name = bookmark.get("name", "").lower()
-                    url = bookmark.get("url", "").lower()
-                    
-                    if query_lower in name or query_lower in url:
-                        matching_bookmarks.append(bookmark)
+            matching_bookmarks = [
+                bookmark for name, url, bookmark in self._search_index
+                if query_lower in name or query_lower in url
+            ]
             
             return {
                 "success": True,
@@ -151,7 +110,7 @@ class BookmarkHandler:
             }
             
         except Exception as e:
-            logger.error(f"Error searching bookmarks: {e}")
+            logger.error("Error searching bookmarks: %s", e)
             return {
                 "success": False,
                 "error": str(e),
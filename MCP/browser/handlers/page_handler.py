@@ -1,69 +1,22 @@
 """Page operations handler for Browser MCP server."""
 
-import asyncio
-import json
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 from utils.logger import setup_logger
+from handlers._command import run_command, state_version
 
 logger = setup_logger(__name__)
 
 class PageHandler:
     """Handles page interaction operations for the browser."""
     
-    def __init__(self):
-        self.base_command = [
-            "python", "-m", "shared_server.cli", "send", "browser"
-        ]
-    
-    def _get_base_path(self):
-        """Get the base path dynamically - go up 3 levels from MCP/browser/handlers/"""
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        return os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+    # How long a page summary is reused by back-to-back calls
+    SUMMARY_TTL = 0.5  # seconds
     
-    async def _run_command(self, command_args: list) -> Dict[str, Any]:
-        """Run a shared_server CLI command for browser operations."""
-        try:
-            full_command = self.base_command + command_args
-            logger.info(f"Running command: {' '.join(full_command)}")
-            
-            # Run the command
-            process = await asyncio.create_subprocess_exec(
-                *full_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self._get_base_path()
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            stdout_text = stdout.decode().strip()
-            stderr_text = stderr.decode().strip()
-            
-            if process.returncode == 0:
-                logger.info(f"Command successful: {stdout_text}")
-                return {
-                    "success": True,
-                    "output": stdout_text,
-                    "command": command_args
-                }
-            else:
-                logger.error(f"Command failed: {stderr_text}")
-                return {
-                    "success": False,
-                    "error": stderr_text,
-                    "output": stdout_text,
-                    "command": command_args,
-                    "return_code": process.returncode
-                }
-                
-        except Exception as e:
-            logger.error(f"Failed to run command {command_args}: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "command": command_args
-            }
+    def __init__(self):
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        self._summary_ts = 0.0
+        self._summary_version = -1
     
     async def click_element(self, selector: str) -> Dict[str, Any]:
         """Click an element using CSS selector."""
@@ -74,7 +27,7 @@ class PageHandler:
                 "operation": "click_element"
             }
         
-        result = await self._run_command(["click", f"selector={selector}"])
+        result = await run_command("click", {"selector": selector})
         result["operation"] = "click_element"
         result["selector"] = selector
         
@@ -89,7 +42,7 @@ class PageHandler:
                 "operation": "click_text"
             }
         
-        result = await self._run_command(["click_text", f"text={text}"])
+        result = await run_command("click_text", {"text": text})
         result["operation"] = "click_text"
         result["text"] = text
         
@@ -97,62 +50,74 @@ class PageHandler:
     
     async def get_page_html(self) -> Dict[str, Any]:
         """Get the current page HTML content."""
-        result = await self._run_command(["get_html_sync"])
+        result = await run_command("get_html_sync")
         result["operation"] = "get_page_html"
         
         if result["success"]:
-            try:
-                # Parse the JSON response to extract HTML
-                response_data = json.loads(result["output"])
-                if isinstance(response_data, dict) and "data" in response_data:
-                    html_content = response_data["data"].get("html", "")
-                    result["html"] = html_content
-                    result["html_length"] = len(html_content)
-                else:
-                    result["html"] = result["output"]
-                    result["html_length"] = len(result["output"])
-            except json.JSONDecodeError:
-                # If not JSON, treat as raw HTML
-                result["html"] = result["output"]
-                result["html_length"] = len(result["output"])
+            # Move the HTML out of "data" so the response doesn't carry it twice
+            html_content = (result.pop("data", None) or {}).get("html", "")
+            result["html"] = html_content
+            result["html_length"] = len(html_content)
+        
+        return result
+    
+    async def _fetch_summary(self) -> Dict[str, Any]:
+        """Fetch the raw page summary, reusing a fresh one when possible.
+        
+        The result holds the app's summary dict under "summary" without
+        copying fields out of it; callers pick only what they need.
+        """
+        # Reuse a fresh summary if nothing that could change the page was sent since
+        if (self._summary_cache is not None
+                and self._summary_version == state_version()
+                and time.monotonic() - self._summary_ts < self.SUMMARY_TTL):
+            return self._summary_cache
+        
+        version = state_version()
+        result = await run_command("summarize")
+        
+        if result["success"]:
+            summary_data = result.pop("data", None)
+            if not isinstance(summary_data, dict):
+                logger.warning("Unexpected page summary payload: %s", type(summary_data).__name__)
+            result["summary"] = summary_data
+            
+            self._summary_cache = result
+            self._summary_ts = time.monotonic()
+            self._summary_version = version
         
         return result
     
     async def summarize_page(self) -> Dict[str, Any]:
         """Get a JSON summary of the current page with title, content, and links."""
-        result = await self._run_command(["summarize"])
+        result = dict(await self._fetch_summary())
         result["operation"] = "summarize_page"
         
-        if result["success"]:
-            try:
-                # Parse the JSON summary
-                summary_data = json.loads(result["output"])
-                result["summary"] = summary_data
-                
-                # Extract key information
-                if isinstance(summary_data, dict):
-                    result["title"] = summary_data.get("title", "")
-                    result["content_excerpt"] = summary_data.get("content", "")
-                    result["links"] = summary_data.get("links", [])
-                    result["link_count"] = len(result["links"])
-                    
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse page summary JSON: {e}")
-                result["raw_output"] = result["output"]
-                result["parse_error"] = str(e)
+        # Extract key information
+        summary_data = result.get("summary")
+        if result["success"] and isinstance(summary_data, dict):
+            result["title"] = summary_data.get("title", "")
+            # The full text is already under summary["content"]; only repeat the excerpt
+            content_excerpt = summary_data.get("content_excerpt")
+            if content_excerpt is None:
+                content_excerpt = summary_data.get("content", "")[:2000]
+            result["content_excerpt"] = content_excerpt
+            result["links"] = summary_data.get("links", [])
+            result["link_count"] = len(result["links"])
         
         return result
     
     async def get_page_title(self) -> Dict[str, Any]:
         """Get the current page title."""
         # Use summarize to get title information
-        summary_result = await self.summarize_page()
+        summary_result = await self._fetch_summary()
+        summary_data = summary_result.get("summary")
         
-        if summary_result["success"] and "title" in summary_result:
+        if summary_result["success"] and isinstance(summary_data, dict):
             return {
                 "success": True,
                 "operation": "get_page_title",
-                "title": summary_result["title"]
+                "title": summary_data.get("title", "")
             }
         else:
             return {
@@ -175,14 +140,16 @@ class PageHandler:
     async def get_page_links(self) -> Dict[str, Any]:
         """Get all links from the current page."""
         # Use summarize to get links information
-        summary_result = await self.summarize_page()
+        summary_result = await self._fetch_summary()
+        summary_data = summary_result.get("summary")
         
-        if summary_result["success"] and "links" in summary_result:
+        if summary_result["success"] and isinstance(summary_data, dict):
+            links = summary_data.get("links", [])
             return {
                 "success": True,
                 "operation": "get_page_links",
-                "links": summary_result["links"],
-                "link_count": summary_result.get("link_count", 0)
+                "links": links,
+                "link_count": len(links)
             }
         else:
             return {
@@ -1,12 +1,11 @@
 """Browser MCP server using FastMCP."""
 
 import asyncio
-import json
-import logging
-from typing import Any, Dict, List, Optional
+import functools
+from contextlib import asynccontextmanager
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
-from mcp.types import TextContent
 
 from handlers.navigation_handler import NavigationHandler
 from handlers.bookmark_handler import BookmarkHandler
@@ -15,17 +14,26 @@ from handlers.bookmark_handler import BookmarkHandler
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from app_launcher import ensure_browser_running
+from app_launcher import install_uvloop, start_prewarm, ensure_browser_running
 from handlers.page_handler import PageHandler
 from handlers.adblock_handler import AdblockHandler
 from utils.logger import setup_logger
-from schemas.tool_schemas import TOOL_SCHEMAS
 
 # Setup logging
 logger = setup_logger(__name__)
 
+@asynccontextmanager
+async def lifespan(server):
+    """Start the browser in the background when MCP_PREWARM=1."""
+    prewarm_task = start_prewarm('browser')
+    try:
+        yield
+    finally:
+        if prewarm_task is not None:
+            prewarm_task.cancel()
+
 # Initialize FastMCP server
-mcp = FastMCP("browser")
+mcp = FastMCP("browser", lifespan=lifespan)
 
 # Initialize handlers
 navigation_handler = NavigationHandler()
@@ -33,12 +41,31 @@ bookmark_handler = BookmarkHandler()
 page_handler = PageHandler()
 adblock_handler = AdblockHandler()
 
+# Browser check currently in flight, shared by concurrent tool calls
+_browser_check: Optional[asyncio.Future] = None
+
 async def ensure_browser_running_wrapper():
-    """Ensure browser is running and return launch result."""
+    """Ensure browser is running and return launch result.
+    
+    Concurrent callers share a single check rather than each probing (and
+    possibly launching) the browser on their own.
+    """
+    global _browser_check
+    if _browser_check is None:
+        _browser_check = asyncio.ensure_future(_check_browser())
+        _browser_check.add_done_callback(_clear_browser_check)
+    return dict(await asyncio.shield(_browser_check))
+
+def _clear_browser_check(_future):
+    global _browser_check
+    _browser_check = None
+
+async def _check_browser():
+    """Run ensure_browser_running and turn the outcome into a tool result."""
     try:
         launch_result = await ensure_browser_running()
         if not launch_result['success']:
-            logger.error(f"Failed to ensure browser is running: {launch_result.get('error')}")
+            logger.error("Failed to ensure browser is running: %s", launch_result.get('error'))
             return {
                 "success": False,
                 "error": f"Browser application not available: {launch_result.get('error')}"
@@ -47,227 +74,188 @@ async def ensure_browser_running_wrapper():
         if launch_result.get('launched'):
             logger.info("Browser launched successfully")
         
-        return {"success": True}
+        return {"success": True, "launched": bool(launch_result.get('launched'))}
         
     except Exception as e:
-        logger.error(f"Error ensuring browser is running: {str(e)}")
+        logger.error("Error ensuring browser is running: %s", e)
         return {
             "success": False,
             "error": str(e)
         }
 
+def _discard_result(task: asyncio.Future):
+    """Retrieve an abandoned call's exception so asyncio doesn't log it."""
+    if not task.cancelled():
+        task.exception()
+
+async def run_alongside_browser_check(operation):
+    """Run a read-only handler call concurrently with the browser check.
+    
+    When the browser is already up, this saves the check's latency. Only if
+    the check had to launch the browser is the early call abandoned and
+    repeated, now that the browser is available; a call that fails against
+    a running browser is a real error and is returned as it is.
+    """
+    check_task = asyncio.ensure_future(ensure_browser_running_wrapper())
+    op_task = asyncio.ensure_future(operation())
+    
+    try:
+        browser_check = await check_task
+    except BaseException:
+        op_task.cancel()
+        op_task.add_done_callback(_discard_result)
+        raise
+    
+    if not browser_check["success"] or browser_check.get("launched"):
+        op_task.cancel()
+        op_task.add_done_callback(_discard_result)
+        if not browser_check["success"]:
+            return browser_check
+        return await operation()
+    
+    return await op_task
+
+def browser_tool(read_only: bool = False):
+    """Wrap a tool with the browser check and common error handling.
+    
+    Tools marked ``read_only`` overlap their call with the browser check
+    (see ``run_alongside_browser_check``).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                if read_only:
+                    return await run_alongside_browser_check(lambda: func(*args, **kwargs))
+                
+                browser_check = await ensure_browser_running_wrapper()
+                if not browser_check["success"]:
+                    return browser_check
+                return await func(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error in %s: %s", func.__name__, e)
+                return {"success": False, "error": str(e)}
+        return wrapper
+    return decorator
+
 # Navigation tools
 @mcp.tool()
+@browser_tool()
 async def open_url(url: str) -> dict:
     """Open a webpage in the browser."""
-    logger.info(f"Opening URL: {url}")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await navigation_handler.open_url(url)
-    except Exception as e:
-        logger.error(f"Error in open_url: {str(e)}")
-        return {"success": False, "error": str(e)}
+    logger.info("Opening URL: %s", url)
+    return await navigation_handler.open_url(url)
 
 @mcp.tool()
+@browser_tool()
 async def navigate_back() -> dict:
     """Navigate back in browser history."""
     logger.info("Navigating back")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await navigation_handler.navigate_back()
-    except Exception as e:
-        logger.error(f"Error in navigate_back: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await navigation_handler.navigate_back()
 
 @mcp.tool()
+@browser_tool()
 async def navigate_forward() -> dict:
     """Navigate forward in browser history."""
     logger.info("Navigating forward")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await navigation_handler.navigate_forward()
-    except Exception as e:
-        logger.error(f"Error in navigate_forward: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await navigation_handler.navigate_forward()
 
 @mcp.tool()
+@browser_tool()
 async def reload_page() -> dict:
     """Reload the current page."""
     logger.info("Reloading page")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await navigation_handler.reload_page()
-    except Exception as e:
-        logger.error(f"Error in reload_page: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await navigation_handler.reload_page()
 
 # Bookmark tools
 @mcp.tool()
+@browser_tool()
 async def add_bookmark(url: Optional[str] = None, name: Optional[str] = None) -> dict:
     """Add a bookmark for the current page or specified URL."""
-    logger.info(f"Adding bookmark: {name} -> {url}")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await bookmark_handler.add_bookmark(url, name)
-    except Exception as e:
-        logger.error(f"Error in add_bookmark: {str(e)}")
-        return {"success": False, "error": str(e)}
+    logger.info("Adding bookmark: %s -> %s", name, url)
+    return await bookmark_handler.add_bookmark(url, name)
 
 @mcp.tool()
+@browser_tool(read_only=True)
 async def get_bookmarks() -> dict:
     """Get all bookmarks as JSON."""
     logger.info("Getting bookmarks")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await bookmark_handler.get_bookmarks()
-    except Exception as e:
-        logger.error(f"Error in get_bookmarks: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await bookmark_handler.get_bookmarks()
 
 # Page interaction tools
 @mcp.tool()
+@browser_tool()
 async def click_element(selector: str) -> dict:
     """Click an element using CSS selector."""
-    logger.info(f"Clicking element: {selector}")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await page_handler.click_element(selector)
-    except Exception as e:
-        logger.error(f"Error in click_element: {str(e)}")
-        return {"success": False, "error": str(e)}
+    logger.info("Clicking element: %s", selector)
+    return await page_handler.click_element(selector)
 
 @mcp.tool()
+@browser_tool()
 async def click_text(text: str) -> dict:
     """Click on text content."""
-    logger.info(f"Clicking text: {text}")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await page_handler.click_text(text)
-    except Exception as e:
-        logger.error(f"Error in click_text: {str(e)}")
-        return {"success": False, "error": str(e)}
+    logger.info("Clicking text: %s", text)
+    return await page_handler.click_text(text)
 
 @mcp.tool()
+@browser_tool(read_only=True)
 async def get_page_html() -> dict:
     """Get the current page HTML content."""
     logger.info("Getting page HTML")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await page_handler.get_page_html()
-    except Exception as e:
-        logger.error(f"Error in get_page_html: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await page_handler.get_page_html()
 
 @mcp.tool()
+@browser_tool(read_only=True)
 async def summarize_page() -> dict:
     """Get a JSON summary of the current page with title, content, and links."""
     logger.info("Summarizing page")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await page_handler.summarize_page()
-    except Exception as e:
-        logger.error(f"Error in summarize_page: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await page_handler.summarize_page()
 
 # Adblock tools
 @mcp.tool()
+@browser_tool()
 async def adblock_enable() -> dict:
     """Enable ad blocking for the current session."""
     logger.info("Enabling adblock")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await adblock_handler.enable_adblock()
-    except Exception as e:
-        logger.error(f"Error in adblock_enable: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await adblock_handler.enable_adblock()
 
 @mcp.tool()
+@browser_tool()
 async def adblock_disable() -> dict:
     """Disable ad blocking for the current session."""
     logger.info("Disabling adblock")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await adblock_handler.disable_adblock()
-    except Exception as e:
-        logger.error(f"Error in adblock_disable: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await adblock_handler.disable_adblock()
 
 @mcp.tool()
+@browser_tool()
 async def adblock_toggle() -> dict:
     """Toggle adblock on/off."""
     logger.info("Toggling adblock")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await adblock_handler.toggle_adblock()
-    except Exception as e:
-        logger.error(f"Error in adblock_toggle: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await adblock_handler.toggle_adblock()
 
 @mcp.tool()
+@browser_tool(read_only=True)
 async def adblock_status() -> dict:
     """Get current adblock status."""
     logger.info("Getting adblock status")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await adblock_handler.get_status()
-    except Exception as e:
-        logger.error(f"Error in adblock_status: {str(e)}")
-        return {"success": False, "error": str(e)}
+    return await adblock_handler.get_status()
 
 @mcp.tool()
+@browser_tool()
 async def adblock_load_rules(path: str, is_directory: bool = False) -> dict:
     """Load adblock rules from file or directory."""
-    logger.info(f"Loading adblock rules from: {path} (directory: {is_directory})")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await adblock_handler.load_rules(path, is_directory)
-    except Exception as e:
-        logger.error(f"Error in adblock_load_rules: {str(e)}")
-        return {"success": False, "error": str(e)}
+    logger.info("Loading adblock rules from: %s (directory: %s)", path, is_directory)
+    return await adblock_handler.load_rules(path, is_directory)
 
 @mcp.tool()
+@browser_tool()
 async def adblock_fetch_easylist(url: Optional[str] = None) -> dict:
     """Fetch EasyList rules from URL."""
-    logger.info(f"Fetching EasyList from: {url}")
-    browser_check = await ensure_browser_running_wrapper()
-    if not browser_check["success"]:
-        return browser_check
-    try:
-        return await adblock_handler.fetch_easylist(url)
-    except Exception as e:
-        logger.error(f"Error in adblock_fetch_easylist: {str(e)}")
-        return {"success": False, "error": str(e)}
+    logger.info("Fetching EasyList from: %s", url)
+    return await adblock_handler.fetch_easylist(url)
 
 if __name__ == "__main__":
     logger.info("Starting Browser MCP Server with FastMCP...")
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
     mcp.run()
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Shared CLI plumbing for Radio Player MCP handlers."""
+
+from functools import wraps
+
+from utils import setup_logger
+from handlers._worker import BASE_PATH, cli_worker
+
+logger = setup_logger(__name__)
+
+def cli_safe(action: str):
+    """Turn any exception from a handler method into an ``Error <action>: ...`` reply."""
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await method(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error %s: %s", action, e)
+                return f"Error {action}: {str(e)}"
+        return wrapper
+    return decorator
+
+class CliHandlerBase:
+    """Base class for handlers that drive the radio_player CLI."""
+    
+    # Handlers are stateless; subclasses declare empty slots too so no
+    # instance carries a __dict__
+    __slots__ = ()
+    
+    # Repository root, resolved once at import rather than per instance
+    base_path = BASE_PATH
+    
+    @staticmethod
+    def _failed(output: str) -> bool:
+        """Whether CLI output reports a failure.
+        
+        Errors come back as "Error: ..."; the CLI also reports some failures
+        (e.g. no GUI to talk to) with a "✗" line while still exiting 0.
+        """
+        return output.startswith(("Error", "✗"))
+    
+    async def _run_cli_command(self, command: list) -> str:
+        """Run radio_player.cli with ``command`` as argv and return the output."""
+        return (await self._run_cli_commands([command]))[0]
+    
+    async def _run_cli_commands(self, commands: list) -> list:
+        """Run several CLI commands in one worker round trip, in order."""
+        try:
+            # Run the commands in the shared long-lived CLI worker
+            replies = await cli_worker.run_chain(commands)
+        except Exception as e:
+            logger.error("Error running CLI command: %s", e)
+            return [f"Error: {str(e)}"] * len(commands)
+        
+        outputs = []
+        for returncode, stdout, stderr in replies:
+            if returncode != 0:
+                error_msg = stderr.strip() if stderr else "Command failed"
+                logger.error("CLI command failed: %s", error_msg)
+                outputs.append(f"Error: {error_msg}")
+            else:
+                outputs.append(stdout.strip())
+        return outputs
@@ -0,0 +1,124 @@
+"""Persistent radio_player.cli workers shared by the Radio Player MCP handlers."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Repository root (three levels up from MCP/radio_player/handlers/), resolved once
+BASE_PATH = str(Path(__file__).resolve().parents[3])
+
+# Search listings can be long; don't let readline() choke on them
+MAX_REPLY_SIZE = 16 * 1024 * 1024
+
+# Worker processes started at most; enough that a slow GUI search doesn't
+# hold up a stop or volume change queued behind it
+MAX_WORKERS = 4
+
+
+class CliWorker:
+    """One long-lived ``python -m radio_player.cli_worker`` process.
+
+    Commands are written as JSON lines and answered in order, so a lock keeps
+    each request paired with its reply. The process is started on first use
+    and restarted if it dies.
+    """
+
+    def __init__(self):
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def _ensure_process(self) -> asyncio.subprocess.Process:
+        if self._process is None or self._process.returncode is not None:
+            self._process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "radio_player.cli_worker",
+                cwd=BASE_PATH,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                limit=MAX_REPLY_SIZE
+            )
+            logger.info("Started radio CLI worker with PID %s", self._process.pid)
+        return self._process
+
+    def _discard_process(self):
+        """Kill the worker so the next command starts from a clean pipe."""
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        self._process = None
+
+    async def run(self, command: List[str]) -> Tuple[int, str, str]:
+        """Run radio_player.cli with ``command`` as argv; return (returncode, stdout, stderr)."""
+        return (await self.run_chain([command]))[0]
+
+    async def run_chain(self, commands: List[List[str]]) -> List[Tuple[int, str, str]]:
+        """Run CLI commands back to back, writing them all before reading.
+
+        The worker still executes them one after another, in order, but the
+        caller pays a single round trip instead of one per command.
+        """
+        requests = b"".join(
+            json.dumps({"argv": command}).encode("utf-8") + b"\n"
+            for command in commands
+        )
+
+        async with self._lock:
+            process = await self._ensure_process()
+            replies = []
+            try:
+                process.stdin.write(requests)
+                await process.stdin.drain()
+                for _ in commands:
+                    line = await process.stdout.readline()
+                    if not line:
+                        self._discard_process()
+                        raise RuntimeError("Radio CLI worker exited unexpectedly")
+                    reply = json.loads(line)
+                    replies.append((reply["returncode"], reply["stdout"], reply["stderr"]))
+            except (OSError, ValueError, asyncio.CancelledError):
+                self._discard_process()
+                raise
+            return replies
+
+
+class CliWorkerPool:
+    """Up to ``max_workers`` CliWorkers, started only when all are busy.
+
+    Each command (or chain) runs on an idle worker, or a new one while under
+    the limit; past that, commands queue round-robin behind busy workers.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self._max_workers = max_workers
+        self._workers: List[CliWorker] = []
+        self._next = 0
+
+    def _pick(self) -> CliWorker:
+        for worker in self._workers:
+            if not worker.busy:
+                return worker
+        if len(self._workers) < self._max_workers:
+            self._workers.append(CliWorker())
+            return self._workers[-1]
+        self._next = (self._next + 1) % len(self._workers)
+        return self._workers[self._next]
+
+    async def run(self, command: List[str]) -> Tuple[int, str, str]:
+        """Run radio_player.cli with ``command`` as argv on a free worker."""
+        return await self._pick().run(command)
+
+    async def run_chain(self, commands: List[List[str]]) -> List[Tuple[int, str, str]]:
+        """Run commands in order on a single worker (see CliWorker.run_chain)."""
+        return await self._pick().run_chain(commands)
+
+
+# Shared by all handlers so the worker processes are shared too
+cli_worker = CliWorkerPool()
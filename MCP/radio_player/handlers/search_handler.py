@@ -2,170 +2,160 @@
 
 import asyncio
 import json
+import time
 from typing import Dict, Any, Optional, List
 
 from utils import setup_logger
+from handlers._base import CliHandlerBase, cli_safe
 
 logger = setup_logger(__name__)
 
-class SearchHandler:
+# How long a repeated identical search is answered from the previous run
+SEARCH_TTL = 30.0
+
+class SearchHandler(CliHandlerBase):
     """Handler for radio station search operations."""
     
+    __slots__ = ("_last_search",)
+    
     def __init__(self):
-        # Get the base path dynamically - go up 3 levels from MCP/radio_player/handlers/
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.base_path = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+        # (command, task, started) for the most recent gui-search
+        self._last_search = None
     
-    async def _run_cli_command(self, command: list) -> str:
-        """Run a CLI command and return the output."""
-        try:
-            # Change to the correct directory and run the command
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                cwd=self.base_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode().strip() if stderr else "Command failed"
-                logger.error(f"CLI command failed: {error_msg}")
-                return f"Error: {error_msg}"
-            
-            return stdout.decode().strip()
-            
-        except Exception as e:
-            logger.error(f"Error running CLI command: {e}")
-            return f"Error: {str(e)}"
+    async def _gui_search(self, command: list) -> str:
+        """Run a gui-search, sharing the result of an identical recent one.
+        
+        gui-search also fills the GUI's list and the results play-index
+        reads, so only the most recent search is reused: repeating it within
+        SEARCH_TTL (or while it is still running) leaves both as they are.
+        """
+        key = tuple(command)
+        last = self._last_search
+        if last is None or last[0] != key or time.monotonic() - last[2] >= SEARCH_TTL:
+            last = (key, asyncio.ensure_future(self._run_cli_command(command)), time.monotonic())
+            self._last_search = last
+        
+        result = await asyncio.shield(last[1])
+        if self._failed(result) and self._last_search is last:
+            # Don't replay failures
+            self._last_search = None
+        return result
     
+    @cli_safe("searching stations")
     async def search_stations(self, query: str, limit: int = 10) -> str:
         """Search for radio stations by name, genre, or general query."""
-        try:
-            # Use gui-search to search and store results for later use
-            result = await self._run_cli_command([
-                "python", "-m", "radio_player.cli", "gui-search",
-                "--name", query, "--limit", str(limit)
-            ])
-            
-            logger.info(f"Searched for stations with query '{query}', limit {limit}")
-            return f"Search results for '{query}': {result}"
-            
-        except Exception as e:
-            logger.error(f"Error searching stations: {e}")
-            return f"Error searching stations: {str(e)}"
+        # Use gui-search to search and store results for later use
+        result = await self._gui_search([
+            "gui-search",
+            "--name", query, "--limit", str(limit)
+        ])
+        
+        logger.info("Searched for stations with query '%s', limit %s", query, limit)
+        return f"Search results for '{query}': {result}"
     
+    @cli_safe("searching by genre")
     async def search_by_genre(self, genre: str, limit: int = 10) -> str:
         """Search stations by specific genre/tag."""
-        try:
-            # Use gui-search with tag parameter
-            result = await self._run_cli_command([
-                "python", "-m", "radio_player.cli", "gui-search",
-                "--tag", genre, "--limit", str(limit)
-            ])
-            
-            logger.info(f"Searched for stations by genre '{genre}', limit {limit}")
-            return f"Search results for genre '{genre}': {result}"
-            
-        except Exception as e:
-            logger.error(f"Error searching by genre: {e}")
-            return f"Error searching by genre: {str(e)}"
+        # Use gui-search with tag parameter
+        result = await self._gui_search([
+            "gui-search",
+            "--tag", genre, "--limit", str(limit)
+        ])
+        
+        logger.info("Searched for stations by genre '%s', limit %s", genre, limit)
+        return f"Search results for genre '{genre}': {result}"
     
+    @cli_safe("searching by country")
     async def search_by_country(self, country: str, limit: int = 10) -> str:
         """Search stations by country."""
-        try:
-            # Use gui-search with country parameter
-            result = await self._run_cli_command([
-                "python", "-m", "radio_player.cli", "gui-search",
-                "--country", country, "--limit", str(limit)
-            ])
-            
-            logger.info(f"Searched for stations by country '{country}', limit {limit}")
-            return f"Search results for country '{country}': {result}"
-            
-        except Exception as e:
-            logger.error(f"Error searching by country: {e}")
-            return f"Error searching by country: {str(e)}"
+        # Use gui-search with country parameter
+        result = await self._gui_search([
+            "gui-search",
+            "--country", country, "--limit", str(limit)
+        ])
+        
+        logger.info("Searched for stations by country '%s', limit %s", country, limit)
+        return f"Search results for country '{country}': {result}"
     
+    @cli_safe("searching by language")
     async def search_by_language(self, language: str, limit: int = 10) -> str:
         """Search stations by language."""
-        try:
-            # Use gui-search with language parameter
-            result = await self._run_cli_command([
-                "python", "-m", "radio_player.cli", "gui-search",
-                "--language", language, "--limit", str(limit)
-            ])
-            
-            logger.info(f"Searched for stations by language '{language}', limit {limit}")
-            return f"Search results for language '{language}': {result}"
-            
-        except Exception as e:
-            logger.error(f"Error searching by language: {e}")
-            return f"Error searching by language: {str(e)}"
+        # Use gui-search with language parameter
+        result = await self._gui_search([
+            "gui-search",
+            "--language", language, "--limit", str(limit)
+        ])
+        
+        logger.info("Searched for stations by language '%s', limit %s", language, limit)
+        return f"Search results for language '{language}': {result}"
+    
+    @cli_safe("getting popular stations")
+    async def get_popular_stations(self, limit: int = 10) -> str:
+        """Get popular stations."""
+        # An unfiltered gui-search, as the GUI uses for its initial station list
+        result = await self._gui_search([
+            "gui-search",
+            "--limit", str(limit)
+        ])
+        
+        logger.info("Listed popular stations, limit %s", limit)
+        return f"Popular stations: {result}"
     
+    @cli_safe("in search and play")
     async def search_and_play(self, query: Optional[str] = None, genre: Optional[str] = None, 
                              country: Optional[str] = None, language: Optional[str] = None) -> str:
         """Search for stations and immediately play the first result."""
-        try:
-            command = ["python", "-m", "radio_player.cli", "search-play"]
-            
-            # Add search parameters
-            if query:
-                command.extend(["--name", query])
-            if genre:
-                command.extend(["--tag", genre])
-            if country:
-                command.extend(["--country", country])
-            if language:
-                command.extend(["--language", language])
-            
-            # If no parameters provided, default to a general search
-            if not any([query, genre, country, language]):
-                logger.warning("No search parameters provided for search_and_play")
-                return "Error: No search parameters provided. Please specify at least one of: query, genre, country, or language."
-            
-            result = await self._run_cli_command(command)
-            
-            search_params = f"query='{query}', genre='{genre}', country='{country}', language='{language}'"
-            logger.info(f"Searched and played station with parameters: {search_params}")
-            return f"Searched and playing station ({search_params}): {result}"
-            
-        except Exception as e:
-            logger.error(f"Error in search and play: {e}")
-            return f"Error in search and play: {str(e)}"
+        command = ["search-play"]
+        
+        # Add search parameters
+        if query:
+            command.extend(["--name", query])
+        if genre:
+            command.extend(["--tag", genre])
+        if country:
+            command.extend(["--country", country])
+        if language:
+            command.extend(["--language", language])
+        
+        # If no parameters provided, default to a general search
+        if not any([query, genre, country, language]):
+            logger.warning("No search parameters provided for search_and_play")
+            return "Error: No search parameters provided. Please specify at least one of: query, genre, country, or language."
+        
+        # search-play searches the GUI too, so the last gui-search is stale
+        self._last_search = None
+        result = await self._run_cli_command(command)
+        
+        search_params = f"query='{query}', genre='{genre}', country='{country}', language='{language}'"
+        logger.info("Searched and played station with parameters: %s", search_params)
+        return f"Searched and playing station ({search_params}): {result}"
     
+    @cli_safe("in advanced search")
     async def advanced_search(self, name: Optional[str] = None, genre: Optional[str] = None,
                              country: Optional[str] = None, language: Optional[str] = None,
                              limit: int = 10) -> str:
         """Advanced search with multiple criteria."""
-        try:
-            command = ["python", "-m", "radio_player.cli", "gui-search"]
-            
-            # Add search parameters
-            if name:
-                command.extend(["--name", name])
-            if genre:
-                command.extend(["--tag", genre])
-            if country:
-                command.extend(["--country", country])
-            if language:
-                command.extend(["--language", language])
-            
-            command.extend(["--limit", str(limit)])
-            
-            # If no parameters provided, return error
-            if not any([name, genre, country, language]):
-                logger.warning("No search parameters provided for advanced_search")
-                return "Error: No search parameters provided. Please specify at least one search criterion."
-            
-            result = await self._run_cli_command(command)
-            
-            search_params = f"name='{name}', genre='{genre}', country='{country}', language='{language}', limit={limit}"
-            logger.info(f"Advanced search with parameters: {search_params}")
-            return f"Advanced search results ({search_params}): {result}"
-            
-        except Exception as e:
-            logger.error(f"Error in advanced search: {e}")
-            return f"Error in advanced search: {str(e)}"
\ No newline at end of file
+        command = ["gui-search"]
+        
+        # Add search parameters
+        if name:
+            command.extend(["--name", name])
+        if genre:
+            command.extend(["--tag", genre])
+        if country:
+            command.extend(["--country", country])
+        if language:
+            command.extend(["--language", language])
+        
+        command.extend(["--limit", str(limit)])
+        
+        # If no parameters provided, return error
+        if not any([name, genre, country, language]):
+            logger.warning("No search parameters provided for advanced_search")
+            return "Error: No search parameters provided. Please specify at least one search criterion."
+        
+        result = await self._gui_search(command)
+        
+        search_params = f"name='{name}', genre='{genre}', country='{country}', language='{language}', limit={limit}"
+        logger.info("Advanced search with parameters: %s", search_params)
+        return f"Advanced search results ({search_params}): {result}"
\ No newline at end of file
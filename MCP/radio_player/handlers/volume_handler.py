@@ -1,48 +1,22 @@
 """Volume handler for Radio Player MCP server."""
 
-import asyncio
 from typing import Dict, Any, Optional
 
 from utils import setup_logger
+from handlers._base import CliHandlerBase
 
 logger = setup_logger(__name__)
 
-class VolumeHandler:
+class VolumeHandler(CliHandlerBase):
     """Handler for radio player volume control operations."""
     
+    __slots__ = ("_current_volume", "_is_muted", "_volume_before_mute")
+    
     def __init__(self):
-        # Get the base path dynamically - go up 3 levels from MCP/radio_player/handlers/
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.base_path = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
         self._current_volume = None
         self._is_muted = False
         self._volume_before_mute = None
     
-    async def _run_cli_command(self, command: list) -> str:
-        """Run a CLI command and return the output."""
-        try:
-            # Change to the correct directory and run the command
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                cwd=self.base_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode().strip() if stderr else "Command failed"
-                logger.error(f"CLI command failed: {error_msg}")
-                return f"Error: {error_msg}"
-            
-            return stdout.decode().strip()
-            
-        except Exception as e:
-            logger.error(f"Error running CLI command: {e}")
-            return f"Error: {str(e)}"
-    
     async def set_volume(self, level: int) -> str:
         """Set playback volume (0-100)."""
         try:
@@ -52,22 +26,27 @@ class VolumeHandler:
                 logger.error(error_msg)
                 return f"Error: {error_msg}"
             
+            # Nothing to send if the player is already at this level
+            if level == self._current_volume and not self._is_muted:
+                return f"Volume already at {level}%"
+            
             # Use the control volume command
             result = await self._run_cli_command([
-                "python", "-m", "radio_player.cli", "control", "volume",
+                "control", "volume",
                 "--level", str(level)
             ])
             
-            # Update internal state
-            self._current_volume = level
-            if level > 0:
-                self._is_muted = False
+            # Update internal state, only once the player has taken the level
+            if not self._failed(result):
+                self._current_volume = level
+                if level > 0:
+                    self._is_muted = False
             
-            logger.info(f"Set volume to {level}%")
+            logger.info("Set volume to %s%%", level)
             return f"Volume set to {level}%: {result}"
             
         except Exception as e:
-            logger.error(f"Error setting volume: {e}")
+            logger.error("Error setting volume: %s", e)
             return f"Error setting volume: {str(e)}"
     
     async def get_volume(self) -> str:
@@ -82,13 +61,11 @@ class VolumeHandler:
                 return f"Current volume: {self._current_volume}% ({status})"
             else:
                 # Try to get status which might include volume info
-                status_result = await self._run_cli_command([
-                    "python", "-m", "radio_player.cli", "control", "status"
-                ])
+                status_result = await self._run_cli_command(["control", "status"])
                 return f"Volume info not available directly. Status: {status_result}"
             
         except Exception as e:
-            logger.error(f"Error getting volume: {e}")
+            logger.error("Error getting volume: %s", e)
             return f"Error getting volume: {str(e)}"
     
     async def mute_audio(self) -> str:
@@ -97,6 +74,9 @@ class VolumeHandler:
         Note: The CLI doesn't have a direct mute command, so we set volume to 0.
         """
         try:
+            if self._is_muted:
+                return "Audio is already muted"
+            
             # Store current volume before muting
             if self._current_volume is not None and self._current_volume > 0:
                 self._volume_before_mute = self._current_volume
@@ -106,19 +86,20 @@ class VolumeHandler:
             
             # Set volume to 0
             result = await self._run_cli_command([
-                "python", "-m", "radio_player.cli", "control", "volume",
+                "control", "volume",
                 "--level", "0"
             ])
             
-            # Update internal state
-            self._current_volume = 0
-            self._is_muted = True
+            # Update internal state, only once the player has taken the level
+            if not self._failed(result):
+                self._current_volume = 0
+                self._is_muted = True
             
             logger.info("Audio muted (volume set to 0)")
             return f"Audio muted: {result}"
             
         except Exception as e:
-            logger.error(f"Error muting audio: {e}")
+            logger.error("Error muting audio: %s", e)
             return f"Error muting audio: {str(e)}"
     
     async def unmute_audio(self) -> str:
@@ -134,19 +115,20 @@ class VolumeHandler:
             restore_volume = self._volume_before_mute or 50
             
             result = await self._run_cli_command([
-                "python", "-m", "radio_player.cli", "control", "volume",
+                "control", "volume",
                 "--level", str(restore_volume)
             ])
             
-            # Update internal state
-            self._current_volume = restore_volume
-            self._is_muted = False
+            # Update internal state, only once the player has taken the level
+            if not self._failed(result):
+                self._current_volume = restore_volume
+                self._is_muted = False
             
-            logger.info(f"Audio unmuted (volume restored to {restore_volume}%)")
+            logger.info("Audio unmuted (volume restored to %s%%)", restore_volume)
             return f"Audio unmuted, volume restored to {restore_volume}%: {result}"
             
         except Exception as e:
-            logger.error(f"Error unmuting audio: {e}")
+            logger.error("Error unmuting audio: %s", e)
             return f"Error unmuting audio: {str(e)}"
     
     async def toggle_mute(self) -> str:
@@ -158,7 +140,7 @@ class VolumeHandler:
                 return await self.mute_audio()
                 
         except Exception as e:
-            logger.error(f"Error toggling mute: {e}")
+            logger.error("Error toggling mute: %s", e)
             return f"Error toggling mute: {str(e)}"
     
     async def get_mute_status(self) -> str:
@@ -169,5 +151,5 @@ class VolumeHandler:
             return f"Audio is currently {status}{volume_info}"
             
         except Exception as e:
-            logger.error(f"Error getting mute status: {e}")
+            logger.error("Error getting mute status: %s", e)
             return f"Error getting mute status: {str(e)}"
\ No newline at end of file
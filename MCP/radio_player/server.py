@@ -6,7 +6,10 @@ Provides tools for controlling radio playback, managing stations,
 searching for stations, and controlling volume.
 """
 
+import asyncio
+import functools
 import logging
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
 from mcp.types import TextContent, Tool
@@ -17,12 +20,28 @@ from handlers.station_handler import StationHandler
 from handlers.search_handler import SearchHandler
 from handlers.volume_handler import VolumeHandler
 
+# Add parent directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app_launcher import install_uvloop, start_prewarm, ensure_radio_player_running
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(server):
+    """Start the radio player in the background when MCP_PREWARM=1."""
+    prewarm_task = start_prewarm('radio_player')
+    try:
+        yield
+    finally:
+        if prewarm_task is not None:
+            prewarm_task.cancel()
+
 # Initialize FastMCP
-mcp = FastMCP("Radio Player")
+mcp = FastMCP("Radio Player", lifespan=lifespan)
 
 # Initialize handlers
 playback_handler = PlaybackHandler()
@@ -30,228 +49,158 @@ station_handler = StationHandler()
 search_handler = SearchHandler()
 volume_handler = VolumeHandler()
 
-def ensure_radio_player_available():
-    """Check if radio player is available."""
-    try:
-        if not playback_handler.is_radio_player_available():
-            return [{"type": "text", "text": "Radio player application not available. Please start the radio player first."}]
-        return None
-    except Exception as e:
-        logger.error(f"Error checking radio player availability: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+# Radio player check currently in flight, shared by concurrent tool calls
+_radio_check: Optional[asyncio.Future] = None
+
+async def ensure_radio_player_available():
+    """Check if radio player is available, launching it if needed.
+    
+    Concurrent callers share a single check rather than each probing (and
+    possibly launching) the radio player on their own.
+    """
+    global _radio_check
+    if _radio_check is None:
+        _radio_check = asyncio.ensure_future(_check_radio_player())
+        _radio_check.add_done_callback(_clear_radio_check)
+    return await asyncio.shield(_radio_check)
+
+def _clear_radio_check(_future):
+    global _radio_check
+    _radio_check = None
+
+async def _check_radio_player():
+    """Run ensure_radio_player_running; return an error result or None."""
+    try:
+        launch_result = await ensure_radio_player_running()
+        if not launch_result['success']:
+            logger.error("Failed to ensure radio player is running: %s", launch_result.get('error'))
+            return [{"type": "text", "text": f"Radio player application not available: {launch_result.get('error')}"}]
+        
+        if launch_result.get('launched'):
+            logger.info("Radio player launched successfully")
+        
+        return None  # No error, radio player is available
+        
+    except Exception as e:
+        logger.error("Error checking radio player availability: %s", e)
+        return [{"type": "text", "text": f"Error: {str(e)}"}]
+
+def radio_tool(func):
+    """Wrap a tool with the radio player check and common error handling."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        check_result = await ensure_radio_player_available()
+        if check_result:
+            return check_result
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            logger.error("Error in %s: %s", func.__name__, e)
+            return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return wrapper
 
 # Playback control tools
 @mcp.tool()
-def play_station(station_name: str) -> List[Dict[str, Any]]:
+@radio_tool
+async def play_station(station_name: str) -> List[Dict[str, Any]]:
     """Play a specific radio station by name."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = playback_handler.play_station(station_name)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in play_station: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await playback_handler.play_station(station_name=station_name)}]
 
 @mcp.tool()
-def stop_playback() -> List[Dict[str, Any]]:
+@radio_tool
+async def stop_playback() -> List[Dict[str, Any]]:
     """Stop the current radio playback."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = playback_handler.stop_playback()
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in stop_playback: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await playback_handler.stop_playback()}]
 
 @mcp.tool()
-def pause_playback() -> List[Dict[str, Any]]:
+@radio_tool
+async def pause_playback() -> List[Dict[str, Any]]:
     """Pause the current radio playback."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = playback_handler.pause_playback()
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in pause_playback: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await playback_handler.pause_playback()}]
 
 @mcp.tool()
-def resume_playback() -> List[Dict[str, Any]]:
+@radio_tool
+async def resume_playback() -> List[Dict[str, Any]]:
     """Resume the paused radio playback."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = playback_handler.resume_playback()
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in resume_playback: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await playback_handler.resume_playback()}]
 
 @mcp.tool()
-def get_playback_status() -> List[Dict[str, Any]]:
+@radio_tool
+async def get_playback_status() -> List[Dict[str, Any]]:
     """Get the current playback status and information."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = playback_handler.get_playback_status()
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in get_playback_status: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await playback_handler.get_playback_status()}]
 
 @mcp.tool()
-def get_current_station() -> List[Dict[str, Any]]:
+@radio_tool
+async def get_current_station() -> List[Dict[str, Any]]:
     """Get information about the currently playing station."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = playback_handler.get_current_station()
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in get_current_station: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await playback_handler.get_playback_status()}]
 
 # Station management tools
 @mcp.tool()
-def add_favorite_station(station_name: str, station_url: str) -> List[Dict[str, Any]]:
+@radio_tool
+async def add_favorite_station(station_name: str, station_url: str) -> List[Dict[str, Any]]:
     """Add a station to favorites."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = station_handler.add_favorite_station(station_name, station_url)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in add_favorite_station: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await station_handler.add_station(station_name, station_url)}]
 
 @mcp.tool()
-def remove_favorite_station(station_name: str) -> List[Dict[str, Any]]:
+@radio_tool
+async def remove_favorite_station(station_name: str) -> List[Dict[str, Any]]:
     """Remove a station from favorites."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = station_handler.remove_favorite_station(station_name)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in remove_favorite_station: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await station_handler.remove_station(station_name)}]
 
 @mcp.tool()
-def list_favorite_stations() -> List[Dict[str, Any]]:
+@radio_tool
+async def list_favorite_stations() -> List[Dict[str, Any]]:
     """List all favorite stations."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = station_handler.list_favorite_stations()
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in list_favorite_stations: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await station_handler.list_stations()}]
 
 @mcp.tool()
-def get_station_info(station_name: str) -> List[Dict[str, Any]]:
+@radio_tool
+async def get_station_info(station_name: str) -> List[Dict[str, Any]]:
     """Get detailed information about a specific station."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = station_handler.get_station_info(station_name)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in get_station_info: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await station_handler.get_station_info(station_name)}]
 
 # Search tools
 @mcp.tool()
-def search_stations(query: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+@radio_tool
+async def search_stations(query: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
     """Search for radio stations by name, genre, or country."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = search_handler.search_stations(query, limit)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in search_stations: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await search_handler.search_stations(query, limit)}]
 
 @mcp.tool()
-def search_by_genre(genre: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+@radio_tool
+async def search_by_genre(genre: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
     """Search for radio stations by genre."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = search_handler.search_by_genre(genre, limit)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in search_by_genre: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await search_handler.search_by_genre(genre, limit)}]
 
 @mcp.tool()
-def search_by_country(country: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+@radio_tool
+async def search_by_country(country: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
     """Search for radio stations by country."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = search_handler.search_by_country(country, limit)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in search_by_country: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await search_handler.search_by_country(country, limit)}]
 
 @mcp.tool()
-def get_popular_stations(limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+@radio_tool
+async def get_popular_stations(limit: Optional[int] = 10) -> List[Dict[str, Any]]:
     """Get a list of popular radio stations."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = search_handler.get_popular_stations(limit)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in get_popular_stations: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await search_handler.get_popular_stations(limit)}]
 
 # Volume control tools
 @mcp.tool()
-def set_volume(volume: int) -> List[Dict[str, Any]]:
+@radio_tool
+async def set_volume(volume: int) -> List[Dict[str, Any]]:
     """Set the playback volume (0-100)."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = volume_handler.set_volume(volume)
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in set_volume: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await volume_handler.set_volume(volume)}]
 
 @mcp.tool()
-def get_volume() -> List[Dict[str, Any]]:
+@radio_tool
+async def get_volume() -> List[Dict[str, Any]]:
     """Get the current playback volume."""
-    check_result = ensure_radio_player_available()
-    if check_result:
-        return check_result
-    try:
-        result = volume_handler.get_volume()
-        return [{"type": "text", "text": result}]
-    except Exception as e:
-        logger.error(f"Error in get_volume: {e}")
-        return [{"type": "text", "text": f"Error: {str(e)}"}]
+    return [{"type": "text", "text": await volume_handler.get_volume()}]
 
 if __name__ == "__main__":
     logger.info("Starting Radio Player MCP Server with FastMCP...")
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
     mcp.run()
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""Thread pool for the blocking filesystem work of the RAG handlers."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Copies, directory walks and index removal; embedding and querying run in
+# the RAG worker process, so these threads never do CPU-heavy work
+IO_WORKERS = 4
+
+io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="rag-io")
+
+
+async def run_io(func, *args, **kwargs):
+    """Run a blocking call in io_pool and return its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_pool, functools.partial(func, *args, **kwargs))
@@ -0,0 +1,19 @@
+"""Locations of the RAG application the handlers operate on.
+
+Resolved once at import; every handler shares these instead of building
+its own from ``__file__``.
+"""
+
+import sys
+from pathlib import Path
+
+# The rag application directory (repository root / "rag")
+RAG_DIR = Path(__file__).resolve().parents[3] / "rag"
+RAG_MAIN_PATH = RAG_DIR / "main.py"
+RAG_CONFIG_PATH = RAG_DIR / "config.json"
+DATA_DIR = RAG_DIR / "data"
+CHROMA_DB_PATH = RAG_DIR / "chroma_db"
+
+# Add the rag directory to Python path
+if str(RAG_DIR) not in sys.path:
+    sys.path.insert(0, str(RAG_DIR))
@@ -0,0 +1,99 @@
+"""Persistent rag/worker.py process shared by the RAG MCP handlers."""
+
+import asyncio
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import setup_logger
+from handlers._paths import RAG_DIR
+
+logger = setup_logger(__name__)
+
+
+# Indexing prints a line per node; don't let readline() choke on it
+MAX_REPLY_SIZE = 64 * 1024 * 1024
+
+# Commands that leave the index as it was
+READ_ONLY_COMMANDS = {"--query", "--health"}
+
+
+class RagWorker:
+    """One long-lived ``python rag/worker.py`` process.
+
+    Commands are the same arguments ``rag/main.py`` takes, written as JSON
+    lines and answered in order, so a lock keeps each request paired with
+    its reply. The process is started on first use, keeps the models and
+    Chroma client loaded between commands, and is restarted if it dies.
+
+    ``generation`` is bumped by every command that may change the index,
+    so callers caching results can tell when they have gone stale.
+    """
+
+    def __init__(self):
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self.generation = 0
+
+    async def _ensure_process(self) -> asyncio.subprocess.Process:
+        if self._process is None or self._process.returncode is not None:
+            self._process = await asyncio.create_subprocess_exec(
+                sys.executable, str(RAG_DIR / "worker.py"),
+                cwd=str(RAG_DIR),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                limit=MAX_REPLY_SIZE
+            )
+            logger.info("Started RAG worker with PID %s", self._process.pid)
+        return self._process
+
+    def _discard_process(self):
+        """Kill the worker so the next command starts from a clean pipe."""
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        self._process = None
+
+    async def run(self, argv: List[str]) -> Tuple[int, str, str]:
+        """Run a rag/main.py command; return (returncode, stdout, stderr)."""
+        reply = await self.call(argv)
+        return reply["returncode"], reply["stdout"], reply["stderr"]
+
+    async def call(self, argv: List[str]) -> Dict[str, Any]:
+        """Run a rag/main.py command and return the worker's whole reply.
+
+        Besides returncode, stdout and stderr the reply carries ``result``,
+        the value main() returned (the structured answer for --query).
+        """
+        request = json.dumps({"argv": argv}).encode("utf-8") + b"\n"
+        if not argv or argv[0] not in READ_ONLY_COMMANDS:
+            self.generation += 1
+
+        async with self._lock:
+            process = await self._ensure_process()
+            try:
+                process.stdin.write(request)
+                await process.stdin.drain()
+                line = await process.stdout.readline()
+            except (OSError, ValueError, asyncio.CancelledError):
+                self._discard_process()
+                raise
+
+            if not line:
+                self._discard_process()
+                raise RuntimeError("RAG worker exited unexpectedly")
+
+            return json.loads(line)
+
+    async def restart(self):
+        """Stop the worker once in-flight commands finish.
+
+        Needed before the index is removed from disk, since the worker
+        keeps the Chroma client open; the next command starts a fresh one.
+        """
+        async with self._lock:
+            self.generation += 1
+            self._discard_process()
+
+
+# Shared by all handlers so there is only ever one worker process
+rag_worker = RagWorker()
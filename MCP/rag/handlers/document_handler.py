@@ -1,28 +1,186 @@
 """Document handler for RAG MCP server operations."""
 
 import os
-import sys
-import subprocess
+import re
 import asyncio
 import shutil
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
-# Add the rag directory to Python path
-RAG_DIR = Path(__file__).parent.parent.parent.parent / "rag"
-sys.path.insert(0, str(RAG_DIR))
-
+from handlers._paths import RAG_MAIN_PATH, DATA_DIR, CHROMA_DB_PATH
 from utils.logger import setup_logger
+from handlers._worker import rag_worker
+from handlers._io import run_io
 
 logger = setup_logger(__name__)
 
+# Adds (or deletes) arriving within this window go to the index as one command
+BATCH_WINDOW = 0.05  # seconds
+BATCH_MAX = 100
+
+
+def copy_document(src: Path, dst: Path):
+    """Copy a file with its metadata to a new file, like shutil.copy2.
+    
+    ``dst`` is created exclusively, so FileExistsError is raised instead of
+    overwriting a file that is already there (or that a concurrent copy
+    just created). Where available, os.copy_file_range copies inside the
+    kernel and lets btrfs/XFS share the extents instead of duplicating the
+    data; otherwise (or if the filesystems refuse it) it is copied in
+    userspace.
+    """
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        try:
+            remaining = os.fstat(fsrc.fileno()).st_size if hasattr(os, "copy_file_range") else -1
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                remaining = -1
+            if remaining != 0:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                shutil.copyfileobj(fsrc, fdst)
+            shutil.copystat(src, dst)
+        except BaseException:
+            # Don't leave a partial copy behind to block the next attempt
+            os.unlink(dst)
+            raise
+
+def _path_pattern(path: str) -> re.Pattern:
+    """Match ``path`` in worker output only where it is not part of a longer path."""
+    return re.compile(r"(?<![\w./\\-])" + re.escape(path) + r"(?![\w/\\-]|\.\w)")
+
 class DocumentHandler:
     """Handles individual document operations for RAG."""
     
     def __init__(self):
-        self.rag_main_path = RAG_DIR / "main.py"
-        self.data_dir = RAG_DIR / "data"
-        self.chroma_db_path = RAG_DIR / "chroma_db"
+        self.rag_main_path = RAG_MAIN_PATH
+        self.data_dir = DATA_DIR
+        self.chroma_db_path = CHROMA_DB_PATH
+        # Per flag ("--add"/"--delete"): paths waiting for the next batch and
+        # the timer that will send them
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._flush_timers: Dict[str, asyncio.TimerHandle] = {}
+    
+    async def _run_batched(self, flag: str, path: str) -> Tuple[int, str, str]:
+        """Run ``flag path`` in the RAG worker, batched with concurrent calls.
+        
+        Every caller in a batch gets the result of the shared command, so
+        one embedding/Chroma write covers all of them; if that command fails,
+        each path is run again by itself.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(flag, [])
+        pending.append((path, future))
+        
+        if len(pending) >= BATCH_MAX:
+            self._flush(flag)
+        elif flag not in self._flush_timers:
+            self._flush_timers[flag] = loop.call_later(BATCH_WINDOW, self._flush, flag)
+        return await future
+    
+    def _flush(self, flag: str):
+        timer = self._flush_timers.pop(flag, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(flag, [])
+        if batch:
+            asyncio.ensure_future(self._run_batch(flag, batch))
+    
+    async def _run_batch(self, flag: str, batch: List[Tuple[str, asyncio.Future]]):
+        paths = [path for path, _ in batch]
+        if len(paths) > 1:
+            logger.info("Batching %s for %s documents", flag, len(paths))
+        try:
+            returncode, stdout, stderr = await rag_worker.run([flag, *paths])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        if returncode != 0 and len(batch) > 1:
+            # One unreadable file fails the whole command; retry each path on
+            # its own so only the callers whose file is bad see a failure
+            logger.info("Batched %s failed, retrying %s documents one by one", flag, len(batch))
+            for path, future in batch:
+                try:
+                    result = await rag_worker.run([flag, path])
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+        
+        for path, future in batch:
+            if not future.done():
+                output = self._output_for(stdout, path, paths) if len(batch) > 1 else stdout
+                future.set_result((returncode, output, stderr))
+    
+    @staticmethod
+    def _output_for(stdout: str, path: str, paths: List[str]) -> str:
+        """The lines of a batch's output that concern ``path``.
+        
+        Drops lines naming only other documents of the batch, such as their
+        per-document results, and keeps shared lines like the summary. Paths
+        are matched as whole tokens, so ``/d/a.txt`` is not found inside
+        ``/d/data.txt`` or ``/d/a.txt.bak``.
+        """
+        own = _path_pattern(path)
+        others = [_path_pattern(other) for other in paths if other != path]
+        return "\n".join(
+            line for line in stdout.split("\n")
+            if own.search(line) or not any(other.search(line) for other in others)
+        )
+    
+    def _stage_document(self, source_path: Path, dest_path: Path) -> Optional[Dict[str, Any]]:
+        """Copy a document into the data directory; blocking, run in a thread.
+        
+        Returns:
+            None once copied, or the error result for add_document
+        """
+        # Check if source file exists
+        if not source_path.exists():
+            return {
+                "success": False,
+                "error": f"Source file does not exist: {source_path}"
+            }
+        
+        # Check if it's a file (not a directory)
+        if not source_path.is_file():
+            return {
+                "success": False,
+                "error": f"Path is not a file: {source_path}"
+            }
+        
+        # Ensure data directory exists
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Copy file to data directory; the destination is created
+        # exclusively, so concurrent adds of one filename can't overwrite
+        # each other
+        try:
+            copy_document(source_path, dest_path)
+        except FileExistsError:
+            return {
+                "success": False,
+                "error": f"File already exists in data directory: {dest_path}",
+                "suggestion": "Use a different filename or delete the existing file first"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to copy file to data directory: {str(e)}"
+            }
+        return None
     
     async def add_document(self, file_path: str) -> Dict[str, Any]:
         """Add a new document to the index.
@@ -44,76 +202,35 @@ class DocumentHandler:
                 }
             
             source_path = Path(file_path)
-            
-            # Check if source file exists
-            if not source_path.exists():
-                return {
-                    "success": False,
-                    "error": f"Source file does not exist: {file_path}"
-                }
-            
-            # Check if it's a file (not a directory)
-            if not source_path.is_file():
-                return {
-                    "success": False,
-                    "error": f"Path is not a file: {file_path}"
-                }
-            
-            # Ensure data directory exists
-            self.data_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Determine destination path in data directory
             dest_path = self.data_dir / source_path.name
             
-            # Check if file already exists in data directory
-            if dest_path.exists():
-                return {
-                    "success": False,
-                    "error": f"File already exists in data directory: {dest_path}",
-                    "suggestion": "Use a different filename or delete the existing file first"
-                }
-            
-            # Copy file to data directory
-            try:
-                shutil.copy2(source_path, dest_path)
-                logger.info(f"Copied file to: {dest_path}")
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"Failed to copy file to data directory: {str(e)}"
-                }
+            # Check the source and copy it into the data directory in one
+            # worker thread hop, keeping these syscalls off the event loop
+            error = await run_io(self._stage_document, source_path, dest_path)
+            if error is not None:
+                return error
+            logger.info(f"Copied file to: {dest_path}")
             
-            # Run the add command
-            cmd = [sys.executable, str(self.rag_main_path), "--add", str(dest_path)]
-            logger.info(f"Running command: {' '.join(cmd)}")
+            # Run the add command in the RAG worker, batched with concurrent adds
+            returncode, stdout, stderr = await self._run_batched("--add", str(dest_path))
             
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(RAG_DIR),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
+            if returncode == 0:
                 return {
                     "success": True,
                     "message": "Document added successfully",
                     "source_path": str(source_path),
                     "dest_path": str(dest_path),
-                    "output": stdout.decode('utf-8')
+                    "output": stdout
                 }
             else:
                 # If indexing failed, remove the copied file
-                if dest_path.exists():
-                    dest_path.unlink()
+                await run_io(dest_path.unlink, missing_ok=True)
                 
                 return {
                     "success": False,
-                    "error": f"Failed to add document to index (return code {process.returncode})",
-                    "stderr": stderr.decode('utf-8'),
-                    "stdout": stdout.decode('utf-8')
+                    "error": f"Failed to add document to index (return code {returncode})",
+                    "stderr": stderr,
+                    "stdout": stdout
                 }
                 
         except Exception as e:
@@ -123,6 +240,18 @@ class DocumentHandler:
                 "error": f"Document add operation failed: {str(e)}"
             }
     
+    @staticmethod
+    def _remove_data_file(target_path: Path) -> bool:
+        """Remove a document from the data directory; blocking, run in a thread.
+        
+        Returns:
+            True if the file was there and has been removed
+        """
+        if not target_path.exists():
+            return False
+        target_path.unlink()
+        return True
+    
     async def delete_document(self, file_path: str) -> Dict[str, Any]:
         """Delete a document from the index.
         
@@ -143,7 +272,7 @@ class DocumentHandler:
                 }
             
             # Check if index exists
-            if not self.chroma_db_path.exists():
+            if not await run_io(self.chroma_db_path.exists):
                 return {
                     "success": False,
                     "error": "No index found. Cannot delete document from non-existent index.",
@@ -157,36 +286,26 @@ class DocumentHandler:
             if not target_path.is_absolute():
                 target_path = self.data_dir / target_path
             
-            # Run the delete command
-            cmd = [sys.executable, str(self.rag_main_path), "--delete", str(target_path)]
-            logger.info(f"Running command: {' '.join(cmd)}")
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(RAG_DIR),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
+            # Run the delete command in the RAG worker, batched with concurrent deletes
+            returncode, stdout, stderr = await self._run_batched("--delete", str(target_path))
             
             result = {
                 "file_path": str(target_path),
-                "output": stdout.decode('utf-8')
+                "output": stdout
             }
             
-            if process.returncode == 0:
+            if returncode == 0:
                 result.update({
                     "success": True,
                     "message": "Document deleted from index successfully"
                 })
                 
                 # Also remove the file from data directory if it exists there
-                if target_path.exists() and target_path.parent == self.data_dir:
+                if target_path.parent == self.data_dir:
                     try:
-                        target_path.unlink()
-                        result["file_removed"] = True
-                        result["message"] += " and file removed from data directory"
+                        if await run_io(self._remove_data_file, target_path):
+                            result["file_removed"] = True
+                            result["message"] += " and file removed from data directory"
                     except Exception as e:
                         result["file_removal_warning"] = f"Could not remove file from data directory: {str(e)}"
                 
@@ -194,9 +313,9 @@ class DocumentHandler:
             else:
                 return {
                     "success": False,
-                    "error": f"Failed to delete document from index (return code {process.returncode})",
-                    "stderr": stderr.decode('utf-8'),
-                    "stdout": stdout.decode('utf-8'),
+                    "error": f"Failed to delete document from index (return code {returncode})",
+                    "stderr": stderr,
+                    "stdout": stdout,
                     "file_path": str(target_path)
                 }
                 
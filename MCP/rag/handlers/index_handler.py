@@ -1,27 +1,80 @@
 """Index handler for RAG MCP server operations."""
 
 import os
-import sys
-import subprocess
-import asyncio
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
-# Add the rag directory to Python path
-RAG_DIR = Path(__file__).parent.parent.parent.parent / "rag"
-sys.path.insert(0, str(RAG_DIR))
-
+from handlers._paths import RAG_MAIN_PATH, DATA_DIR, CHROMA_DB_PATH
 from utils.logger import setup_logger
+from handlers._worker import rag_worker
+from handlers._io import run_io
 
 logger = setup_logger(__name__)
 
+# get_status reuses the measured index size for this long, as long as the
+# RAG worker hasn't changed the index and the index root looks the same
+INDEX_SIZE_TTL = 30.0  # seconds
+
+def scan_tree(root: Path, with_sizes: bool = False) -> Tuple[int, int, int]:
+    """Count files and directories under ``root`` in one os.scandir walk.
+    
+    Returns (files, directories, total file size in bytes); the size is only
+    summed, at one stat per file, when ``with_sizes`` is set. Like rglob,
+    symlinked directories are counted but not descended into.
+    """
+    files = dirs = size = 0
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirs += 1
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    files += 1
+                    if with_sizes:
+                        size += entry.stat().st_size
+    return files, dirs, size
+
 class IndexHandler:
     """Handles document indexing operations for RAG."""
     
     def __init__(self):
-        self.rag_main_path = RAG_DIR / "main.py"
-        self.data_dir = RAG_DIR / "data"
-        self.chroma_db_path = RAG_DIR / "chroma_db"
+        self.rag_main_path = RAG_MAIN_PATH
+        self.data_dir = DATA_DIR
+        self.chroma_db_path = CHROMA_DB_PATH
+        # (worker generation, index root mtime, measured at, size in bytes)
+        self._index_size_cache: Optional[Tuple[int, float, float, int]] = None
+    
+    async def _index_size(self) -> int:
+        """Total size of the index directory, walked in a thread and cached."""
+        generation = rag_worker.generation
+        mtime = (await run_io(os.stat, self.chroma_db_path)).st_mtime
+        cached = self._index_size_cache
+        if (cached is not None and cached[:2] == (generation, mtime)
+                and time.monotonic() - cached[2] < INDEX_SIZE_TTL):
+            return cached[3]
+        
+        _, _, size = await run_io(scan_tree, self.chroma_db_path, True)
+        self._index_size_cache = (generation, mtime, time.monotonic(), size)
+        return size
+    
+    def _dirs_exist(self) -> Tuple[bool, bool]:
+        """Whether the data and index directories exist; blocking, run in a thread."""
+        return self.data_dir.exists(), self.chroma_db_path.exists()
+    
+    def _count_documents(self) -> Optional[int]:
+        """Count the files in the data directory; blocking, run in a thread.
+        
+        Returns:
+            The number of files, or None if the data directory does not exist
+        """
+        if not self.data_dir.exists():
+            return None
+        files, _, _ = scan_tree(self.data_dir)
+        return files
     
     async def index_all_documents(self, force_reindex: bool = False) -> Dict[str, Any]:
         """Index or re-index all documents in the data directory.
@@ -35,16 +88,15 @@ class IndexHandler:
         try:
             logger.info(f"Starting document indexing (force_reindex={force_reindex})")
             
-            # Check if data directory exists
-            if not self.data_dir.exists():
+            # Check that the data directory exists and has documents to index
+            doc_count = await run_io(self._count_documents)
+            if doc_count is None:
                 return {
                     "success": False,
                     "error": f"Data directory does not exist: {self.data_dir}",
                     "suggestion": "Create the data directory and add documents to index"
                 }
             
-            # Check if there are documents to index
-            doc_count = sum(1 for f in self.data_dir.rglob('*') if f.is_file())
             if doc_count == 0:
                 return {
                     "success": False,
@@ -54,38 +106,30 @@ class IndexHandler:
                 }
             
             # Remove existing index if force_reindex is True
-            if force_reindex and self.chroma_db_path.exists():
+            if force_reindex and await run_io(self.chroma_db_path.exists):
                 logger.info("Removing existing index for re-indexing")
+                # The worker holds the Chroma client open on this directory
+                await rag_worker.restart()
                 import shutil
-                shutil.rmtree(self.chroma_db_path)
-            
-            # Run the indexing command
-            cmd = [sys.executable, str(self.rag_main_path), "--index"]
-            logger.info(f"Running command: {' '.join(cmd)}")
+                await run_io(shutil.rmtree, self.chroma_db_path)
             
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(RAG_DIR),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            # Run the indexing command in the RAG worker
+            returncode, stdout, stderr = await rag_worker.run(["--index"])
             
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
+            if returncode == 0:
                 return {
                     "success": True,
                     "message": "Documents indexed successfully",
                     "documents_found": doc_count,
-                    "output": stdout.decode('utf-8'),
+                    "output": stdout,
                     "index_path": str(self.chroma_db_path)
                 }
             else:
                 return {
                     "success": False,
-                    "error": f"Indexing failed with return code {process.returncode}",
-                    "stderr": stderr.decode('utf-8'),
-                    "stdout": stdout.decode('utf-8')
+                    "error": f"Indexing failed with return code {returncode}",
+                    "stderr": stderr,
+                    "stdout": stdout
                 }
                 
         except Exception as e:
@@ -107,23 +151,15 @@ class IndexHandler:
         try:
             logger.info("Performing RAG health check")
             
-            # Run health check command
-            cmd = [sys.executable, str(self.rag_main_path), "--health"]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(RAG_DIR),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
+            # Run health check command in the RAG worker
+            returncode, stdout, stderr = await rag_worker.run(["--health"])
+            data_dir_exists, index_exists = await run_io(self._dirs_exist)
             
             health_status = {
-                "success": process.returncode == 0,
-                "rag_executable": process.returncode == 0,
-                "data_dir_exists": self.data_dir.exists(),
-                "index_exists": self.chroma_db_path.exists()
+                "success": returncode == 0,
+                "rag_executable": returncode == 0,
+                "data_dir_exists": data_dir_exists,
+                "index_exists": index_exists
             }
             
             if detailed:
@@ -131,8 +167,8 @@ class IndexHandler:
                     "data_dir_path": str(self.data_dir),
                     "index_path": str(self.chroma_db_path),
                     "rag_main_path": str(self.rag_main_path),
-                    "stdout": stdout.decode('utf-8'),
-                    "stderr": stderr.decode('utf-8')
+                    "stdout": stdout,
+                    "stderr": stderr
                 })
             
             return health_status
@@ -156,27 +192,28 @@ class IndexHandler:
         try:
             logger.info("Getting RAG system status")
             
+            data_dir_exists, index_exists = await run_io(self._dirs_exist)
             status = {
                 "data_directory": str(self.data_dir),
-                "data_dir_exists": self.data_dir.exists(),
+                "data_dir_exists": data_dir_exists,
                 "index_directory": str(self.chroma_db_path),
-                "index_exists": self.chroma_db_path.exists()
+                "index_exists": index_exists
             }
             
             if include_stats:
                 # Count documents in data directory
-                if self.data_dir.exists():
-                    doc_files = list(self.data_dir.rglob('*'))
-                    status["total_files"] = len([f for f in doc_files if f.is_file()])
-                    status["total_directories"] = len([f for f in doc_files if f.is_dir()])
+                if data_dir_exists:
+                    status["total_files"], status["total_directories"], _ = await run_io(
+                        scan_tree, self.data_dir
+                    )
                 else:
                     status["total_files"] = 0
                     status["total_directories"] = 0
                 
                 # Get index size if it exists
-                if self.chroma_db_path.exists():
+                if index_exists:
                     try:
-                        index_size = sum(f.stat().st_size for f in self.chroma_db_path.rglob('*') if f.is_file())
+                        index_size = await self._index_size()
                         status["index_size_bytes"] = index_size
                         status["index_size_mb"] = round(index_size / (1024 * 1024), 2)
                     except Exception as e:
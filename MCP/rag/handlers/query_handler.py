@@ -1,26 +1,80 @@
 """Query handler for RAG MCP server operations."""
 
 import os
-import sys
-import subprocess
+import time
 import asyncio
-from typing import Dict, Any, Optional
-from pathlib import Path
-
-# Add the rag directory to Python path
-RAG_DIR = Path(__file__).parent.parent.parent.parent / "rag"
-sys.path.insert(0, str(RAG_DIR))
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
+from handlers._paths import RAG_MAIN_PATH, CHROMA_DB_PATH
 from utils.logger import setup_logger
+from handlers._worker import rag_worker
+from handlers._io import run_io
 
 logger = setup_logger(__name__)
 
+# Answers to repeated queries are reused for this long, unless the index
+# changes in the meantime
+QUERY_CACHE_TTL = 30.0  # seconds
+QUERY_CACHE_MAX = 64
+
+# Returned as-is by start_interactive_mode
+INTERACTIVE_INSTRUCTIONS = (
+    "Interactive mode allows continuous querying of the RAG system",
+    "To use interactive mode directly, run: python rag/main.py",
+    "For MCP integration, use the rag_query tool for individual queries"
+)
+INTERACTIVE_COMMANDS = (
+    "Type your questions and press Enter",
+    "Type 'quit' or 'exit' to leave interactive mode",
+    "Type 'help' for more information"
+)
+
 class QueryHandler:
     """Handles query operations for RAG."""
     
     def __init__(self):
-        self.rag_main_path = RAG_DIR / "main.py"
-        self.chroma_db_path = RAG_DIR / "chroma_db"
+        self.rag_main_path = RAG_MAIN_PATH
+        self.chroma_db_path = CHROMA_DB_PATH
+        # query -> running worker command, shared by identical concurrent queries
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # query -> (worker generation, finished at, worker reply)
+        self._cache: "OrderedDict[str, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+    
+    async def _run_shared(self, query: str) -> Dict[str, Any]:
+        """Run a query in the RAG worker at most once for concurrent callers.
+        
+        A caller that arrives while the same query is running awaits that
+        run; one that arrives shortly after a cacheable answer gets its reply
+        again, as long as nothing has modified the index since.
+        """
+        cached = self._cache.get(query)
+        if cached is not None:
+            generation, finished, reply = cached
+            if generation == rag_worker.generation and time.monotonic() - finished < QUERY_CACHE_TTL:
+                self._cache.move_to_end(query)
+                return reply
+            del self._cache[query]
+        
+        task = self._inflight.get(query)
+        if task is None:
+            task = asyncio.ensure_future(self._run_and_cache(query))
+            self._inflight[query] = task
+            task.add_done_callback(lambda _: self._inflight.pop(query, None))
+        # One caller giving up must not cancel the run for the others
+        return await asyncio.shield(task)
+    
+    async def _run_and_cache(self, query: str) -> Dict[str, Any]:
+        generation = rag_worker.generation
+        reply = await rag_worker.call(["--query", query])
+        # Only plain answers are replayed: not failures, and not answers
+        # whose query executed tool calls that a repeat should run again
+        result = reply.get("result") or {}
+        if reply["returncode"] == 0 and result.get("cacheable"):
+            self._cache[query] = (generation, time.monotonic(), reply)
+            while len(self._cache) > QUERY_CACHE_MAX:
+                self._cache.popitem(last=False)
+        return reply
     
     async def run_query(self, query: str, max_results: int = 5, include_metadata: bool = True) -> Dict[str, Any]:
         """Run a query against the indexed documents.
@@ -37,7 +91,7 @@ class QueryHandler:
             logger.info(f"Running query: {query[:100]}...")
             
             # Check if index exists
-            if not self.chroma_db_path.exists():
+            if not await run_io(self.chroma_db_path.exists):
                 return {
                     "success": False,
                     "error": "No index found. Please run indexing first.",
@@ -51,48 +105,29 @@ class QueryHandler:
                     "error": "Query cannot be empty"
                 }
             
-            # Run the query command
-            cmd = [sys.executable, str(self.rag_main_path), "--query", query.strip()]
-            logger.info(f"Running command: {' '.join(cmd)}")
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(RAG_DIR),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            # Run the query command in the RAG worker, shared with identical queries
+            reply = await self._run_shared(query.strip())
+            returncode = reply["returncode"]
             
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                output = stdout.decode('utf-8')
-                
-                # Parse the output to extract the answer and sources
+            if returncode == 0:
+                # main() returns the answer and its retrieved sources directly
+                answer = reply.get("result") or {}
                 result = {
                     "success": True,
                     "query": query,
-                    "answer": output,
+                    "answer": answer.get("answer", reply["stdout"]),
                     "max_results_requested": max_results
                 }
                 
                 if include_metadata:
-                    # Try to extract source information from the output
-                    # This is a simple parsing - could be enhanced based on actual output format
-                    if "Source:" in output or "File:" in output:
-                        lines = output.split('\n')
-                        sources = []
-                        for line in lines:
-                            if line.strip().startswith(('Source:', 'File:')):
-                                sources.append(line.strip())
-                        result["sources"] = sources
+                    result["sources"] = answer.get("sources", [])[:max_results]
                 
                 return result
             else:
-                error_output = stderr.decode('utf-8')
                 return {
                     "success": False,
-                    "error": f"Query failed with return code {process.returncode}",
-                    "stderr": error_output,
+                    "error": f"Query failed with return code {returncode}",
+                    "stderr": reply["stderr"],
                     "query": query
                 }
                 
@@ -117,7 +152,7 @@ class QueryHandler:
             logger.info("Starting interactive query mode")
             
             # Check if index exists
-            if not self.chroma_db_path.exists():
+            if not await run_io(self.chroma_db_path.exists):
                 return {
                     "success": False,
                     "error": "No index found. Please run indexing first.",
@@ -129,16 +164,8 @@ class QueryHandler:
             result = {
                 "success": True,
                 "message": "Interactive mode information",
-                "instructions": [
-                    "Interactive mode allows continuous querying of the RAG system",
-                    "To use interactive mode directly, run: python rag/main.py",
-                    "For MCP integration, use the rag_query tool for individual queries"
-                ],
-                "available_commands": [
-                    "Type your questions and press Enter",
-                    "Type 'quit' or 'exit' to leave interactive mode",
-                    "Type 'help' for more information"
-                ]
+                "instructions": INTERACTIVE_INSTRUCTIONS,
+                "available_commands": INTERACTIVE_COMMANDS
             }
             
             # If an initial query is provided, run it
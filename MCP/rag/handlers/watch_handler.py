@@ -1,30 +1,110 @@
 """Watch handler for RAG MCP server operations."""
 
-import os
-import sys
-import subprocess
+import json
 import asyncio
-import signal
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
 
-# Add the rag directory to Python path
-RAG_DIR = Path(__file__).parent.parent.parent.parent / "rag"
-sys.path.insert(0, str(RAG_DIR))
+from watchfiles import Change, awatch
 
+from handlers._paths import RAG_CONFIG_PATH, DATA_DIR
 from utils.logger import setup_logger
+from handlers._worker import rag_worker
 
 logger = setup_logger(__name__)
 
+# Changes are handed over once the directory has been quiet for
+# WATCH_QUIET_MS, or WATCH_MAX_DELAY_MS after the first one at the latest,
+# so an editor's burst of writes and renames on save becomes one batch
+WATCH_QUIET_MS = 250
+WATCH_MAX_DELAY_MS = 1600
+
+# Returned as-is in every successful start_watching result
+WATCH_INSTRUCTIONS = (
+    "The system is now monitoring the data directory for changes",
+    "Files added, modified, or deleted will automatically update the index",
+    "Use rag_stop_watching to stop the file watcher"
+)
+
+def load_exclude_list() -> List[str]:
+    """Read the exclusion patterns the RAG application is configured with."""
+    try:
+        with open(RAG_CONFIG_PATH, 'r') as f:
+            return json.load(f).get("exclude_list", [])
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read RAG exclude list: {str(e)}")
+        return []
+
 class WatchHandler:
     """Handles file watching operations for RAG."""
     
     def __init__(self):
-        self.rag_main_path = RAG_DIR / "main.py"
-        self.data_dir = RAG_DIR / "data"
-        self.watch_process: Optional[asyncio.subprocess.Process] = None
+        self.data_dir = DATA_DIR
+        self.exclude_list = load_exclude_list()
+        self.watch_path: Optional[Path] = None
+        self.watch_task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
         self.is_watching = False
     
+    def _should_index(self, path: Path) -> bool:
+        """Apply the hidden-file and exclude-list rules of rag/file_watcher.py."""
+        try:
+            relative_path = path.relative_to(self.watch_path)
+        except ValueError:
+            relative_path = path
+        if any(part.startswith('.') for part in relative_path.parts):
+            return False
+        return not any(path.match(pattern) for pattern in self.exclude_list)
+        
+    async def _watch(self, watch_path: Path):
+        """Keep the index in step with the directory until the stop event is set.
+        
+        Each batch from awatch is one debounce window with every path in it
+        once. New files are added; edited files are deleted from the index
+        and added again; removed files are deleted from it. A batch reaches
+        the RAG worker as at most one --delete and one --add command, so
+        files copied in together, or saved in several steps, go as one.
+        """
+        try:
+            async for changes in awatch(
+                watch_path,
+                stop_event=self._stop_event,
+                step=WATCH_QUIET_MS,
+                debounce=WATCH_MAX_DELAY_MS
+            ):
+                kinds: Dict[str, Set[Change]] = {}
+                for change, path in changes:
+                    if self._should_index(Path(path)):
+                        kinds.setdefault(path, set()).add(change)
+                
+                # Index entries to drop: files that are gone, and files that
+                # were changed in place (they are added again below)
+                stale, current = [], []
+                for path in sorted(kinds):
+                    if Path(path).is_file():
+                        current.append(path)
+                        if Change.modified in kinds[path]:
+                            stale.append(path)
+                    elif Change.deleted in kinds[path] and not Path(path).exists():
+                        stale.append(path)
+                
+                if stale:
+                    logger.info(f"Changed or removed file(s) detected: {', '.join(stale)}")
+                    returncode, stdout, stderr = await rag_worker.run(["--delete", *stale])
+                    if returncode != 0:
+                        logger.error(f"Failed to remove file(s) from the index (return code {returncode}): {stderr}")
+                if current:
+                    logger.info(f"New or changed file(s) detected: {', '.join(current)}")
+                    returncode, stdout, stderr = await rag_worker.run(["--add", *current])
+                    if returncode != 0:
+                        logger.error(f"Failed to index file(s) (return code {returncode}): {stderr}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"File watcher stopped: {str(e)}")
+        finally:
+            self.is_watching = False
+    
     async def start_watching(self, watch_directory: Optional[str] = None) -> Dict[str, Any]:
         """Start watching the data directory for changes.
         
@@ -38,7 +118,7 @@ class WatchHandler:
             logger.info("Starting file watching")
             
             # Check if already watching
-            if self.is_watching and self.watch_process:
+            if self.is_watching and self.watch_task:
                 return {
                     "success": False,
                     "error": "File watching is already active",
@@ -61,53 +141,23 @@ class WatchHandler:
                 watch_path.mkdir(parents=True, exist_ok=True)
                 logger.info(f"Created watch directory: {watch_path}")
             
-            # Start the watch command
-            cmd = [sys.executable, str(self.rag_main_path), "--watch"]
-            logger.info(f"Starting watch command: {' '.join(cmd)}")
-            
-            self.watch_process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(RAG_DIR),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                preexec_fn=os.setsid if hasattr(os, 'setsid') else None
-            )
-            
+            # Watch from this process; new files are indexed by the RAG worker
+            self.watch_path = watch_path
+            self._stop_event = asyncio.Event()
+            self.watch_task = asyncio.create_task(self._watch(watch_path))
             self.is_watching = True
             
-            # Give the process a moment to start
-            await asyncio.sleep(1)
-            
-            # Check if process is still running
-            if self.watch_process.returncode is not None:
-                # Process has already terminated
-                stdout, stderr = await self.watch_process.communicate()
-                self.is_watching = False
-                self.watch_process = None
-                
-                return {
-                    "success": False,
-                    "error": f"Watch process terminated immediately (return code {self.watch_process.returncode})",
-                    "stderr": stderr.decode('utf-8'),
-                    "stdout": stdout.decode('utf-8')
-                }
-            
             return {
                 "success": True,
                 "message": "File watching started successfully",
                 "watch_directory": str(watch_path),
-                "process_id": self.watch_process.pid,
-                "instructions": [
-                    "The system is now monitoring the data directory for changes",
-                    "Files added, modified, or deleted will automatically update the index",
-                    "Use rag_stop_watching to stop the file watcher"
-                ]
+                "instructions": WATCH_INSTRUCTIONS
             }
             
         except Exception as e:
             logger.error(f"Error starting file watching: {str(e)}")
             self.is_watching = False
-            self.watch_process = None
+            self.watch_task = None
             return {
                 "success": False,
                 "error": f"Failed to start file watching: {str(e)}"
@@ -122,57 +172,34 @@ class WatchHandler:
         try:
             logger.info("Stopping file watching")
             
-            if not self.is_watching or not self.watch_process:
+            if not self.is_watching or not self.watch_task:
                 return {
                     "success": False,
                     "error": "File watching is not currently active",
                     "suggestion": "Use rag_start_watching to start file watching"
                 }
             
-            # Try to terminate the process gracefully
+            # awatch returns once the stop event is set; an --add already
+            # sent to the worker is allowed to finish first
+            self._stop_event.set()
             try:
-                if hasattr(os, 'killpg'):
-                    # Kill the entire process group (Unix-like systems)
-                    os.killpg(os.getpgid(self.watch_process.pid), signal.SIGTERM)
-                else:
-                    # Fallback for systems without process groups
-                    self.watch_process.terminate()
-                
-                # Wait for process to terminate
-                try:
-                    await asyncio.wait_for(self.watch_process.wait(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    # Force kill if it doesn't terminate gracefully
-                    if hasattr(os, 'killpg'):
-                        os.killpg(os.getpgid(self.watch_process.pid), signal.SIGKILL)
-                    else:
-                        self.watch_process.kill()
-                    await self.watch_process.wait()
-                
-                return_code = self.watch_process.returncode
-                
-            except ProcessLookupError:
-                # Process was already terminated
-                return_code = 0
-            except Exception as e:
-                logger.warning(f"Error terminating watch process: {str(e)}")
-                return_code = -1
-            
+                await asyncio.wait_for(self.watch_task, timeout=5.0)
+            except asyncio.TimeoutError:
+                logger.warning("File watcher did not stop in time, cancelled it")
             finally:
                 self.is_watching = False
-                self.watch_process = None
+                self.watch_task = None
             
             return {
                 "success": True,
-                "message": "File watching stopped successfully",
-                "return_code": return_code
+                "message": "File watching stopped successfully"
             }
             
         except Exception as e:
             logger.error(f"Error stopping file watching: {str(e)}")
             # Reset state even if there was an error
             self.is_watching = False
-            self.watch_process = None
+            self.watch_task = None
             return {
                 "success": False,
                 "error": f"Failed to stop file watching: {str(e)}"
@@ -186,11 +213,10 @@ class WatchHandler:
         """
         return {
             "is_watching": self.is_watching,
-            "process_id": self.watch_process.pid if self.watch_process else None,
-            "watch_directory": str(self.data_dir)
+            "watch_directory": str(self.watch_path or self.data_dir)
         }
     
     async def cleanup(self):
-        """Cleanup method to ensure watch process is stopped."""
-        if self.is_watching and self.watch_process:
+        """Cleanup method to ensure the watcher is stopped."""
+        if self.is_watching and self.watch_task:
             await self.stop_watching()
\ No newline at end of file
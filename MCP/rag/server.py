@@ -11,6 +11,8 @@ Provides MCP tools for controlling the RAG application including:
 
 import json
 import logging
+import os
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 from fastmcp import FastMCP
 from mcp.types import TextContent, Tool
@@ -19,13 +21,29 @@ from handlers.index_handler import IndexHandler
 from handlers.query_handler import QueryHandler
 from handlers.document_handler import DocumentHandler
 from handlers.watch_handler import WatchHandler
+from handlers._io import io_pool
 from utils.logger import setup_logger
 
+try:
+    # Optional: serializes the handlers' result dicts several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
 # Setup logging
 logger = setup_logger(__name__)
 
 # Initialize FastMCP
-mcp = FastMCP("RAG")
+@asynccontextmanager
+async def lifespan(server):
+    """Stop the file watcher and the handlers' I/O threads on shutdown."""
+    try:
+        yield
+    finally:
+        await watch_handler.cleanup()
+        io_pool.shutdown(wait=False, cancel_futures=True)
+
+mcp = FastMCP("RAG", lifespan=lifespan)
 
 # Initialize handlers
 index_handler = IndexHandler()
@@ -33,67 +51,85 @@ query_handler = QueryHandler()
 document_handler = DocumentHandler()
 watch_handler = WatchHandler()
 
-def handle_rag_operation(handler_method, *args, **kwargs):
+# Tool results are read by MCP clients, not people: emit compact JSON unless
+# MCP_PRETTY_JSON is set for debugging
+if os.getenv("MCP_PRETTY_JSON"):
+    _JSON_OPTIONS = {"indent": 2}
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 if orjson is not None else 0
+else:
+    _JSON_OPTIONS = {"separators": (",", ":")}
+    _ORJSON_OPTIONS = 0
+
+def _dumps(result: Dict[str, Any]) -> str:
+    """Serialize a handler result for a text content block."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(result, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            pass  # e.g. values orjson can't serialize; let json decide
+    return json.dumps(result, **_JSON_OPTIONS)
+
+async def handle_rag_operation(handler_method, *args, **kwargs):
     """Execute RAG operation and format result."""
     try:
-        result = handler_method(*args, **kwargs)
-        return [{"type": "text", "text": json.dumps(result, indent=2)}]
+        result = await handler_method(*args, **kwargs)
+        return [{"type": "text", "text": _dumps(result)}]
     except Exception as e:
         logger.error(f"Error in RAG operation: {e}")
         error_result = {
             "success": False,
             "error": str(e)
         }
-        return [{"type": "text", "text": json.dumps(error_result, indent=2)}]
+        return [{"type": "text", "text": _dumps(error_result)}]
 
 # Index operation tools
 @mcp.tool()
-def rag_index_all() -> List[Dict[str, Any]]:
+async def rag_index_all() -> List[Dict[str, Any]]:
     """Index or re-index all documents in the data directory."""
-    return handle_rag_operation(index_handler.index_all_documents)
+    return await handle_rag_operation(index_handler.index_all_documents)
 
 @mcp.tool()
-def rag_add_document(file_path: str) -> List[Dict[str, Any]]:
+async def rag_add_document(file_path: str) -> List[Dict[str, Any]]:
     """Add a new document to the index."""
-    return handle_rag_operation(document_handler.add_document, file_path)
+    return await handle_rag_operation(document_handler.add_document, file_path)
 
 @mcp.tool()
-def rag_delete_document(file_path: str) -> List[Dict[str, Any]]:
+async def rag_delete_document(file_path: str) -> List[Dict[str, Any]]:
     """Delete a document from the index."""
-    return handle_rag_operation(document_handler.delete_document, file_path)
+    return await handle_rag_operation(document_handler.delete_document, file_path)
 
 # Query operation tools
 @mcp.tool()
-def rag_query(query: str) -> List[Dict[str, Any]]:
+async def rag_query(query: str) -> List[Dict[str, Any]]:
     """Run a query against the indexed documents."""
-    return handle_rag_operation(query_handler.run_query, query)
+    return await handle_rag_operation(query_handler.run_query, query)
 
 @mcp.tool()
-def rag_interactive_query() -> List[Dict[str, Any]]:
+async def rag_interactive_query() -> List[Dict[str, Any]]:
     """Start interactive query mode."""
-    return handle_rag_operation(query_handler.start_interactive_mode)
+    return await handle_rag_operation(query_handler.start_interactive_mode)
 
 # File watching tools
 @mcp.tool()
-def rag_start_watching() -> List[Dict[str, Any]]:
+async def rag_start_watching() -> List[Dict[str, Any]]:
     """Start watching the data directory for changes."""
-    return handle_rag_operation(watch_handler.start_watching)
+    return await handle_rag_operation(watch_handler.start_watching)
 
 @mcp.tool()
-def rag_stop_watching() -> List[Dict[str, Any]]:
+async def rag_stop_watching() -> List[Dict[str, Any]]:
     """Stop watching the data directory."""
-    return handle_rag_operation(watch_handler.stop_watching)
+    return await handle_rag_operation(watch_handler.stop_watching)
 
 # Status and health tools
 @mcp.tool()
-def rag_health_check() -> List[Dict[str, Any]]:
+async def rag_health_check() -> List[Dict[str, Any]]:
     """Perform a health check on the RAG system."""
-    return handle_rag_operation(index_handler.health_check)
+    return await handle_rag_operation(index_handler.health_check)
 
 @mcp.tool()
-def rag_get_status() -> List[Dict[str, Any]]:
+async def rag_get_status() -> List[Dict[str, Any]]:
     """Get current status of the RAG system."""
-    return handle_rag_operation(index_handler.get_status)
+    return await handle_rag_operation(index_handler.get_status)
 
 if __name__ == "__main__":
     logger.info("Starting RAG MCP Server with FastMCP...")
@@ -4,6 +4,15 @@ import logging
 import sys
 from typing import Optional
 
+# One console handler and formatter shared by every logger set up here;
+# each logger's own level does the filtering
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+_HANDLER = logging.StreamHandler(sys.stderr)
+_HANDLER.setFormatter(_FORMATTER)
+
 def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """Setup logger for RAG MCP server components.
     
@@ -24,19 +33,8 @@ def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     log_level = getattr(logging, (level or "INFO").upper(), logging.INFO)
     logger.setLevel(log_level)
     
-    # Create console handler
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(log_level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(handler)
+    # Attach the shared console handler
+    logger.addHandler(_HANDLER)
     
     # Prevent propagation to root logger
     logger.propagate = False
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Tests for the RAG MCP server's batching, query cache, worker protocol and
+the tool argument validators of rag/tool_executor.py.
+
+None of these need Ollama, Chroma or a running RAG worker: the worker is
+replaced by a fake, or by a small stand-in script for the protocol tests.
+"""
+
+import asyncio
+import os
+import sys
+import textwrap
+
+import pytest
+
+# The RAG MCP handlers import each other as the top-level "handlers" package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'rag'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handlers import _worker, document_handler, query_handler
+from rag.tool_executor import _compile_validator
+
+
+class FakeWorker:
+    """Records commands and answers them like rag_worker would."""
+
+    def __init__(self, reply=None):
+        self.commands = []
+        self.generation = 0
+        self.reply = reply or (lambda argv: (0, "ok", ""))
+
+    async def run(self, argv):
+        self.commands.append(argv)
+        await asyncio.sleep(0)
+        return self.reply(argv)
+
+    async def call(self, argv):
+        self.commands.append(argv)
+        await asyncio.sleep(0)
+        return self.reply(argv)
+
+
+# Add/delete batching
+
+def test_concurrent_adds_share_one_command(monkeypatch):
+    """Adds within the batch window reach the worker as one --add."""
+    worker = FakeWorker(lambda argv: (0, "\n".join(f"Added {p}" for p in argv[1:]) + "\nDone", ""))
+    monkeypatch.setattr(document_handler, "rag_worker", worker)
+    handler = document_handler.DocumentHandler()
+
+    async def run():
+        return await asyncio.gather(
+            handler._run_batched("--add", "/d/a.txt"),
+            handler._run_batched("--add", "/d/data.txt"),
+        )
+
+    results = asyncio.run(run())
+    assert worker.commands == [["--add", "/d/a.txt", "/d/data.txt"]]
+    # Each caller sees its own lines and the shared ones, not the other's
+    assert results[0] == (0, "Added /d/a.txt\nDone", "")
+    assert results[1] == (0, "Added /d/data.txt\nDone", "")
+
+
+def test_failed_batch_falls_back_to_per_document_results(monkeypatch):
+    """A failing batch is retried path by path; only the bad path fails."""
+    def reply(argv):
+        if "/d/bad.txt" in argv:
+            return 1, "", "cannot read /d/bad.txt"
+        return 0, f"Added {argv[1]}", ""
+
+    worker = FakeWorker(reply)
+    monkeypatch.setattr(document_handler, "rag_worker", worker)
+    handler = document_handler.DocumentHandler()
+
+    async def run():
+        return await asyncio.gather(
+            handler._run_batched("--add", "/d/good.txt"),
+            handler._run_batched("--add", "/d/bad.txt"),
+        )
+
+    good, bad = asyncio.run(run())
+    assert worker.commands == [
+        ["--add", "/d/good.txt", "/d/bad.txt"],
+        ["--add", "/d/good.txt"],
+        ["--add", "/d/bad.txt"],
+    ]
+    assert good == (0, "Added /d/good.txt", "")
+    assert bad == (1, "", "cannot read /d/bad.txt")
+
+
+def test_batch_exception_reaches_every_caller(monkeypatch):
+    """If the worker itself fails, every caller of the batch gets the error."""
+    def reply(argv):
+        raise RuntimeError("RAG worker exited unexpectedly")
+
+    monkeypatch.setattr(document_handler, "rag_worker", FakeWorker(reply))
+    handler = document_handler.DocumentHandler()
+
+    async def run():
+        return await asyncio.gather(
+            handler._run_batched("--delete", "/d/a.txt"),
+            handler._run_batched("--delete", "/d/b.txt"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_output_for_matches_whole_paths():
+    stdout = "Error processing data.txt: bad\nOK a.txt\nread a.txt.bak\nSummary"
+    output = document_handler.DocumentHandler._output_for(stdout, "a.txt", ["a.txt", "data.txt"])
+    assert output == "OK a.txt\nread a.txt.bak\nSummary"
+
+
+# Query cache
+
+def answer(argv, cacheable=True):
+    return {
+        "returncode": 0,
+        "stdout": "",
+        "stderr": "",
+        "result": {"answer": f"answer to {argv[1]}", "sources": [], "cacheable": cacheable},
+    }
+
+
+def test_repeated_query_is_served_from_cache(monkeypatch):
+    worker = FakeWorker(answer)
+    monkeypatch.setattr(query_handler, "rag_worker", worker)
+    handler = query_handler.QueryHandler()
+
+    async def run():
+        first = await handler._run_shared("jazz")
+        second = await handler._run_shared("jazz")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert worker.commands == [["--query", "jazz"]]
+
+
+def test_query_cache_is_invalidated_by_a_new_generation(monkeypatch):
+    """Anything that may change the index makes cached answers stale."""
+    worker = FakeWorker(answer)
+    monkeypatch.setattr(query_handler, "rag_worker", worker)
+    handler = query_handler.QueryHandler()
+
+    async def run():
+        await handler._run_shared("jazz")
+        worker.generation += 1  # e.g. an --add ran in between
+        await handler._run_shared("jazz")
+
+    asyncio.run(run())
+    assert worker.commands == [["--query", "jazz"], ["--query", "jazz"]]
+
+
+def test_query_cache_expires(monkeypatch):
+    worker = FakeWorker(answer)
+    monkeypatch.setattr(query_handler, "rag_worker", worker)
+    monkeypatch.setattr(query_handler, "QUERY_CACHE_TTL", 0.0)
+    handler = query_handler.QueryHandler()
+
+    async def run():
+        await handler._run_shared("jazz")
+        await handler._run_shared("jazz")
+
+    asyncio.run(run())
+    assert len(worker.commands) == 2
+
+
+@pytest.mark.parametrize("reply", [
+    lambda argv: answer(argv, cacheable=False),
+    lambda argv: dict(answer(argv), returncode=1),
+])
+def test_uncacheable_or_failed_answers_are_not_cached(monkeypatch, reply):
+    worker = FakeWorker(reply)
+    monkeypatch.setattr(query_handler, "rag_worker", worker)
+    handler = query_handler.QueryHandler()
+
+    async def run():
+        await handler._run_shared("play jazz")
+        await handler._run_shared("play jazz")
+
+    asyncio.run(run())
+    assert len(worker.commands) == 2
+
+
+def test_concurrent_identical_queries_run_once(monkeypatch):
+    worker = FakeWorker(lambda argv: answer(argv, cacheable=False))
+    monkeypatch.setattr(query_handler, "rag_worker", worker)
+    handler = query_handler.QueryHandler()
+
+    async def run():
+        return await asyncio.gather(*(handler._run_shared("jazz") for _ in range(3)))
+
+    replies = asyncio.run(run())
+    assert worker.commands == [["--query", "jazz"]]
+    assert replies[0] is replies[1] is replies[2]
+
+
+# Worker protocol
+
+# Stands in for rag/worker.py: answers each JSON line with one JSON line,
+# and exits without a reply when asked to
+FAKE_WORKER = textwrap.dedent('''
+    import json, sys
+    for line in sys.stdin:
+        argv = json.loads(line)["argv"]
+        if argv == ["--exit"]:
+            sys.exit(1)
+        print(json.dumps({
+            "returncode": 0,
+            "stdout": " ".join(argv) + "\\n",
+            "stderr": "",
+            "result": {"argv": argv},
+        }), flush=True)
+''')
+
+
+async def stop(worker, *processes):
+    """Kill the worker and reap its processes before the loop closes."""
+    processes += (worker._process,)
+    worker._discard_process()
+    for process in processes:
+        if process is not None:
+            await process.wait()
+
+
+@pytest.fixture
+def fake_rag_dir(tmp_path, monkeypatch):
+    (tmp_path / "worker.py").write_text(FAKE_WORKER)
+    monkeypatch.setattr(_worker, "RAG_DIR", tmp_path)
+    return tmp_path
+
+
+def test_worker_pairs_each_request_with_its_reply(fake_rag_dir):
+    worker = _worker.RagWorker()
+
+    async def run():
+        try:
+            return await asyncio.gather(*(worker.call(["--query", str(i)]) for i in range(5)))
+        finally:
+            await stop(worker)
+
+    replies = asyncio.run(run())
+    assert [reply["result"]["argv"] for reply in replies] == [["--query", str(i)] for i in range(5)]
+
+
+def test_worker_generation_counts_index_changes_only(fake_rag_dir):
+    worker = _worker.RagWorker()
+
+    async def run():
+        try:
+            await worker.run(["--query", "jazz"])
+            await worker.run(["--health"])
+            assert worker.generation == 0
+            await worker.run(["--add", "/d/a.txt"])
+            assert worker.generation == 1
+            await worker.restart()
+            assert worker.generation == 2
+        finally:
+            await stop(worker)
+
+    asyncio.run(run())
+
+
+def test_worker_is_restarted_after_it_exits(fake_rag_dir):
+    worker = _worker.RagWorker()
+
+    async def run():
+        first = await worker._ensure_process()
+        try:
+            with pytest.raises(RuntimeError, match="exited unexpectedly"):
+                await worker.run(["--exit"])
+            return await worker.run(["--health"])
+        finally:
+            await stop(worker, first)
+
+    returncode, stdout, stderr = asyncio.run(run())
+    assert returncode == 0
+    assert stdout.startswith("--health")
+
+
+# Compiled tool argument validators
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "url": {"type": "string"},
+        "limit": {"type": "integer"},
+        "score": {"type": "number"},
+    },
+    "required": ["url"],
+    "additionalProperties": False,
+}
+
+
+@pytest.mark.parametrize("arguments, error", [
+    ({"url": "http://a"}, None),
+    ({"url": "http://a", "limit": 3, "score": 0.5}, None),
+    ({"url": "http://a", "score": 1}, None),
+    ({}, "Missing required argument(s): url"),
+    ({"url": 1}, "Invalid type for 'url': expected string"),
+    ({"url": "http://a", "limit": "3"}, "Invalid type for 'limit': expected integer"),
+    ({"url": "http://a", "name": "x"}, "Unexpected argument(s): name"),
+])
+def test_compiled_validator(arguments, error):
+    assert _compile_validator(SCHEMA)(arguments) == error
+
+
+def test_compiled_validator_allows_extra_arguments_by_default():
+    schema = dict(SCHEMA, additionalProperties=True)
+    assert _compile_validator(schema)({"url": "http://a", "name": "x"}) is None
@@ -3,6 +3,7 @@
 import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 
 from mcp.server.fastmcp import FastMCP
@@ -16,15 +17,25 @@ from handlers.cli_handler import CLIHandler
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from app_launcher import ensure_word_editor_running
+from app_launcher import install_uvloop, start_prewarm, ensure_word_editor_running
 from utils.logger import setup_logger
 from schemas.tool_schemas import TOOL_SCHEMAS
 
 # Setup logging
 logger = setup_logger(__name__)
 
+@asynccontextmanager
+async def lifespan(server):
+    """Start the word editor in the background when MCP_PREWARM=1."""
+    prewarm_task = start_prewarm('word_editor')
+    try:
+        yield
+    finally:
+        if prewarm_task is not None:
+            prewarm_task.cancel()
+
 # Initialize FastMCP server
-mcp = FastMCP("word-editor")
+mcp = FastMCP("word-editor", lifespan=lifespan)
 
 # Initialize handlers
 text_handler = TextHandler()
@@ -167,4 +178,6 @@ async def check_gui_status() -> List[Dict[str, Any]]:
 
 if __name__ == "__main__":
     logger.info("Starting Word Editor MCP Server with FastMCP...")
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
     mcp.run()
\ No newline at end of file
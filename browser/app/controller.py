@@ -37,6 +37,20 @@ class SimpleEasyListFilter:
         self.cosmetic_by_domain: Dict[str, List[str]] = defaultdict(list)
         self.cosmetic_exceptions: Dict[str, List[str]] = defaultdict(list)
         self.cosmetic_global: List[str] = []
+        # (path, mtime, size) of the files behind the current rules, so reloading
+        # unchanged files can skip the read and re-parse
+        self._loaded_key: tuple | None = None
+        self._loaded_message = ""
+
+    def _files_key(self, paths: List[str]) -> tuple | None:
+        key = []
+        for p in paths:
+            try:
+                st = Path(p).stat()
+            except OSError:
+                return None
+            key.append((str(p), st.st_mtime_ns, st.st_size))
+        return tuple(key)
 
     def _compile_domain_rule(self, domain: str) -> Pattern:
         # convert example.com to regex for host match
@@ -79,6 +93,9 @@ class SimpleEasyListFilter:
                 self.cosmetic_by_domain[d].append(selector)
 
     def load_easylist(self, path: str) -> Dict[str, Any]:
+        key = self._files_key([path])
+        if key is not None and key == self._loaded_key:
+            return {"status": "success", "message": self._loaded_message}
         try:
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 lines = f.readlines()
@@ -146,9 +163,14 @@ class SimpleEasyListFilter:
         self.cosmetic_by_domain = cosmetic_by_domain
         self.cosmetic_exceptions = cosmetic_exceptions
         self.cosmetic_global = cosmetic_global
-        return {"status": "success", "message": f"Loaded {len(blocks)} block rules, {len(exceptions)} exceptions, {sum(len(v) for v in cosmetic_by_domain.values())} cosmetic, {sum(len(v) for v in cosmetic_exceptions.values())} cosmetic exceptions, {len(cosmetic_global)} global cosmetics"}
+        self._loaded_key = key
+        self._loaded_message = f"Loaded {len(blocks)} block rules, {len(exceptions)} exceptions, {sum(len(v) for v in cosmetic_by_domain.values())} cosmetic, {sum(len(v) for v in cosmetic_exceptions.values())} cosmetic exceptions, {len(cosmetic_global)} global cosmetics"
+        return {"status": "success", "message": self._loaded_message}
 
     def load_easylist_multi(self, paths: List[str]) -> Dict[str, Any]:
+        key = self._files_key(paths)
+        if key is not None and key == self._loaded_key:
+            return {"status": "success", "message": self._loaded_message}
         total_blocks: List[Pattern] = []
         total_exceptions: List[Pattern] = []
         cosmetic_by_domain: Dict[str, List[str]] = defaultdict(list)
@@ -209,7 +231,9 @@ class SimpleEasyListFilter:
         self.cosmetic_by_domain = cosmetic_by_domain
         self.cosmetic_exceptions = cosmetic_exceptions
         self.cosmetic_global = cosmetic_global
-        return {"status": "success", "message": f"Loaded {len(total_blocks)} block rules and {len(total_exceptions)} exceptions from {loaded} files; cosmetics: {sum(len(v) for v in cosmetic_by_domain.values())}, exceptions: {sum(len(v) for v in cosmetic_exceptions.values())}, global: {len(cosmetic_global)}"}
+        self._loaded_key = key
+        self._loaded_message = f"Loaded {len(total_blocks)} block rules and {len(total_exceptions)} exceptions from {loaded} files; cosmetics: {sum(len(v) for v in cosmetic_by_domain.values())}, exceptions: {sum(len(v) for v in cosmetic_exceptions.values())}, global: {len(cosmetic_global)}"
+        return {"status": "success", "message": self._loaded_message}
 
     def load_easylist_dir(self, dir_path: str) -> Dict[str, Any]:
         base = Path(dir_path)
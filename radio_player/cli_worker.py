@@ -0,0 +1,70 @@
+"""Long-lived runner for radio_player.cli commands.
+
+Reads one JSON request per line on stdin, ``{"argv": [...]}``, runs
+``radio_player.cli.main(argv)`` in-process and writes one JSON line back:
+``{"returncode": int, "stdout": str, "stderr": str}``. This lets callers such
+as the Radio Player MCP server issue many CLI commands without paying
+interpreter startup and imports for each one.
+
+Run with: python -m radio_player.cli_worker
+"""
+
+import io
+import json
+import os
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+from . import cli
+
+
+def run_cli(argv):
+    """Run one CLI command, returning (returncode, stdout, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    returncode = 0
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            cli.main(argv)
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                returncode = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return returncode, out.getvalue(), err.getvalue()
+
+
+def main():
+    # Keep the real stdin and stdout for the protocol and point fds 0 and 1
+    # at /dev/null and stderr. What the CLI prints through sys.stdout is
+    # captured per request; this covers what bypasses it: the player that
+    # `play` starts inherits fds 0-2, and native libraries write to fd 1.
+    requests = os.fdopen(os.dup(sys.stdin.fileno()), "rb")
+    reply = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, sys.stdin.fileno())
+    os.close(devnull)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    for line in requests:
+        if not line.strip():
+            continue
+        try:
+            argv = json.loads(line)["argv"]
+            returncode, stdout, stderr = run_cli([str(a) for a in argv])
+        except (ValueError, KeyError, TypeError) as e:
+            returncode, stdout, stderr = 2, "", f"Invalid request: {e}"
+        reply.write(json.dumps({
+            "returncode": returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+        }).encode('utf-8') + b"\n")
+        reply.flush()
+
+
+if __name__ == "__main__":
+    main()
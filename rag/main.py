@@ -57,33 +57,74 @@ SAFE_RAG_MAIN = os.path.abspath(__file__)
 # This eliminates code duplication and ensures consistent behavior across all applications
 
 
-def main():
+# Models, vector store and query pipeline, built on first use and then kept
+# for the life of the process (see worker.py, which runs many commands)
+_vector_store_manager = None
+_query_pipeline = None
+
+
+def get_vector_store_manager():
+    """Return the process-wide VectorStoreManager, setting up the models once."""
+    global _vector_store_manager
+    if _vector_store_manager is None:
+        llm, embedding_model = setup_ollama_models(
+            OLLAMA_LLM_MODEL, OLLAMA_EMBEDDING_MODEL, OLLAMA_REQUEST_TIMEOUT, LLM_MODEL_PARAMS, OLLAMA_BASE_URL
+        )
+        _vector_store_manager = VectorStoreManager(
+            CHROMA_DB_PATH, CHROMA_COLLECTION_NAME, embedding_model
+        )
+    return _vector_store_manager
+
+
+def get_query_pipeline():
+    """Return the process-wide MCP-enabled RAG pipeline, loading it once.
+
+    The pipeline retrieves through the shared vector store, so documents
+    added or deleted later in the same process are still seen.
+    """
+    global _query_pipeline
+    if _query_pipeline is None:
+        index = get_vector_store_manager().index
+        
+        # Use MCP-enabled RAG pipeline for tool calling capabilities
+        _query_pipeline = setup_mcp_enabled_rag(
+            index, 
+            OLLAMA_LLM_MODEL, 
+            OLLAMA_EMBEDDING_MODEL, 
+            OLLAMA_REQUEST_TIMEOUT, 
+            LLM_MODEL_PARAMS,
+            OLLAMA_BASE_URL
+        )
+    return _query_pipeline
+
+
+def main(argv=None):
     """
     Main function to run the RAG application.
+
+    Args:
+        argv: Command-line arguments to parse instead of sys.argv[1:].
+
+    Returns:
+        For --query, a dict with the "answer" text, its "sources" (file,
+        score and snippet per retrieved node) and whether the answer is
+        "cacheable"; otherwise None.
     """
     parser = argparse.ArgumentParser(description="RAG Application using LlamaIndex, Ollama, and ChromaDB")
     parser.add_argument("--index", action="store_true", help="Index or re-index all documents in the data directory.")
     parser.add_argument("--query", type=str, help="Run a specific query.")
-    parser.add_argument("--add", type=str, help="Add a new file to the index. Provide the file path.")
-    parser.add_argument("--delete", type=str, help="Delete a document from the index by its file path.")
+    parser.add_argument("--add", type=str, nargs="+", help="Add new files to the index. Provide one or more file paths.")
+    parser.add_argument("--delete", type=str, nargs="+", help="Delete documents from the index by their file paths.")
     parser.add_argument("--watch", action="store_true", help="Watch the data directory for changes and update the index automatically.")
     parser.add_argument("--health", action="store_true", help="Lightweight health check; exits immediately if CLI is callable.")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Fast health check path (avoid heavy initialization)
     if args.health:
         print("OK")
         return
 
-    # Setup Ollama models
-    llm, embedding_model = setup_ollama_models(
-        OLLAMA_LLM_MODEL, OLLAMA_EMBEDDING_MODEL, OLLAMA_REQUEST_TIMEOUT, LLM_MODEL_PARAMS, OLLAMA_BASE_URL
-    )
-
-    # Initialize VectorStoreManager
-    vector_store_manager = VectorStoreManager(
-        CHROMA_DB_PATH, CHROMA_COLLECTION_NAME, embedding_model
-    )
+    vector_store_manager = get_vector_store_manager()
 
     if args.watch:
         print("Starting file watcher...")
@@ -96,27 +137,17 @@ def main():
         print("Indexing complete.")
 
     elif args.add:
-        print(f"Adding new file: {args.add}")
-        new_docs = SimpleDirectoryReader(input_files=[args.add]).load_data()
+        print(f"Adding new file(s): {', '.join(args.add)}")
+        new_docs = SimpleDirectoryReader(input_files=args.add).load_data()
         vector_store_manager.add_documents(new_docs)
 
     elif args.delete:
-        print(f"Deleting document: {args.delete}")
-        vector_store_manager.delete_documents_by_path([args.delete])
+        print(f"Deleting document(s): {', '.join(args.delete)}")
+        vector_store_manager.delete_documents_by_path(args.delete)
 
     elif args.query:
         print("Loading MCP-enabled RAG pipeline for querying...")
-        index = vector_store_manager.create_or_load_index()
-        
-        # Use MCP-enabled RAG pipeline for tool calling capabilities
-        mcp_pipeline = setup_mcp_enabled_rag(
-            index, 
-            OLLAMA_LLM_MODEL, 
-            OLLAMA_EMBEDDING_MODEL, 
-            OLLAMA_REQUEST_TIMEOUT, 
-            LLM_MODEL_PARAMS,
-            OLLAMA_BASE_URL
-        )
+        mcp_pipeline = get_query_pipeline()
         
         print(f"Query: {args.query}")
         print("Asking LLM with MCP tool calling...")
@@ -124,23 +155,20 @@ def main():
         print(f"Response:\n{response_text}")
         
         # MCP servers now handle all tool calling including radio search
+        return {
+            "answer": response_text,
+            "sources": mcp_pipeline.last_sources,
+            # Failed answers and ones that ran tools (playing a station,
+            # opening a URL) must be recomputed, not served from a cache
+            "cacheable": not (mcp_pipeline.last_failed or mcp_pipeline.last_tools_run)
+        }
 
     else:
         print("No specific action requested. Starting interactive query mode.")
         print("Type 'exit' to quit.")
         
         try:
-            index = vector_store_manager.create_or_load_index()
-            
-            # Use MCP-enabled RAG pipeline for interactive mode
-            mcp_pipeline = setup_mcp_enabled_rag(
-                index, 
-                OLLAMA_LLM_MODEL, 
-                OLLAMA_EMBEDDING_MODEL, 
-                OLLAMA_REQUEST_TIMEOUT, 
-                LLM_MODEL_PARAMS,
-                OLLAMA_BASE_URL
-            )
+            mcp_pipeline = get_query_pipeline()
             
             print(f"Available MCP tools: {list(mcp_pipeline.get_available_tools().keys())}")
             
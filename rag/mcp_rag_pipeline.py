@@ -9,7 +9,7 @@ import os
 import sys
 import json
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 
 # Add MCP directory to path
@@ -30,6 +30,12 @@ class MCPRAGPipeline:
         self.mcp_bridge = None
         self.query_engine = None
         self.is_initialized = False
+        # Retrieved nodes behind the most recent answer, see _collect_sources
+        self.last_sources: List[Dict[str, Any]] = []
+        # Whether the most recent query failed or executed MCP tool calls;
+        # such answers must not be replayed in place of running the query
+        self.last_failed = False
+        self.last_tools_run = False
         
     async def initialize(self, index: 'VectorStoreIndex', llm):
         """Initialize the MCP-enabled RAG pipeline.
@@ -163,6 +169,24 @@ class MCPRAGPipeline:
         
         self.query_engine._query = mcp_enabled_query
     
+    @staticmethod
+    def _collect_sources(response) -> List[Dict[str, Any]]:
+        """Describe the source nodes of a query engine response.
+        
+        Returns:
+            One dict per node: its file, reranker score and a text snippet
+        """
+        sources = []
+        for node_with_score in getattr(response, "source_nodes", None) or []:
+            node = node_with_score.node
+            metadata = node.metadata or {}
+            sources.append({
+                "file": metadata.get("file_path") or metadata.get("file_name"),
+                "score": None if node_with_score.score is None else float(node_with_score.score),
+                "snippet": node.get_content()[:200]
+            })
+        return sources
+    
     async def query_with_mcp(self, query: str, model: str = "gemma3:1b") -> str:
         """Query with MCP tool calling support.
         
@@ -176,6 +200,7 @@ class MCPRAGPipeline:
         if not self.is_initialized:
             raise RuntimeError("RAG pipeline not initialized")
         
+        self.last_failed = self.last_tools_run = False
         try:
             # Use MCP-enabled RAG pipeline with tool calling
             print("ℹ️  Using MCP-enabled RAG pipeline with tool execution")
@@ -188,7 +213,9 @@ class MCPRAGPipeline:
                 print(f"🔍 Querying with: {query}")
                 print(f"📊 Query engine type: {type(self.query_engine)}")
             
+            self.last_sources = []
             response = self.query_engine.query(query_bundle)
+            self.last_sources = self._collect_sources(response)
             
             if os.getenv("RAG_DEBUG") == "1":
                 print(f"📋 Raw response type: {type(response)}")
@@ -214,6 +241,7 @@ class MCPRAGPipeline:
                     tool_calls = executor.generate_missing_tool_calls(response_text)
                 
                 if tool_calls:
+                    self.last_tools_run = True
                     if os.getenv("RAG_DEBUG") == "1":
                         print(f"🔧 Found {len(tool_calls)} tool calls to execute")
                     
@@ -252,6 +280,7 @@ class MCPRAGPipeline:
             return response_text
             
         except Exception as e:
+            self.last_failed = True
             error_msg = f"Error in MCP query: {e}"
             if os.getenv("RAG_DEBUG") == "1":
                 print(f"❌ {error_msg}")
@@ -267,6 +296,7 @@ class MCPRAGPipeline:
         Returns:
             The response, potentially after executing MCP tools
         """
+        self.last_failed = self.last_tools_run = False
         try:
             # Always route through async MCP-enabled flow to enable tool execution
             try:
@@ -285,6 +315,7 @@ class MCPRAGPipeline:
                 finally:
                     loop.close()
         except Exception as e:
+            self.last_failed = True
             error_msg = f"Error in sync MCP query: {e}"
             if os.getenv("RAG_DEBUG") == "1":
                 print(f"❌ {error_msg}")
@@ -11,9 +11,119 @@ import json
 import re
 import subprocess
 import sys
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 import importlib.util
 
+# JSON Schema "type" keywords checked by the tool argument validators
+_SCHEMA_TYPES = {
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+    'object': dict,
+    'array': list,
+}
+
+# schemas file path -> {tool name: compiled validator}, or None if the file
+# couldn't be loaded; filled on first use and kept for the process
+_VALIDATOR_CACHE: Dict[str, Optional[Dict[str, Callable[[Dict[str, Any]], Optional[str]]]]] = {}
+
+
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], Optional[str]]:
+    """Turn one tool's input schema into a validator function.
+
+    Required names, per-property types and the allowed names are worked out
+    here once, so each call only checks the arguments against them. The
+    validator returns None if the arguments are valid, else an error message.
+    """
+    required = tuple(schema.get('required', []))
+    props: Dict[str, Any] = schema.get('properties', {})
+    typed = {
+        key: (prop['type'], _SCHEMA_TYPES[prop['type']])
+        for key, prop in props.items()
+        if prop.get('type') in _SCHEMA_TYPES
+    }
+    allowed = frozenset(props) if schema.get('additionalProperties') is False else None
+
+    def validate(arguments: Dict[str, Any]) -> Optional[str]:
+        # Check required fields
+        missing = [k for k in required if k not in arguments]
+        if missing:
+            return f"Missing required argument(s): {', '.join(missing)}"
+
+        # Basic type checking for provided arguments
+        for key, value in arguments.items():
+            if key in typed:
+                expected, py_type = typed[key]
+                if not isinstance(value, py_type):
+                    return f"Invalid type for '{key}': expected {expected}"
+
+        # additionalProperties: False enforcement
+        if allowed is not None:
+            extra = [k for k in arguments if k not in allowed]
+            if extra:
+                return f"Unexpected argument(s): {', '.join(extra)}"
+
+        return None
+
+    return validate
+
+
+# Tool to server mapping, used to route and validate every tool call
+TOOL_SERVER_MAP = {
+    # Browser tools
+    "open_url": "browser",
+    "navigate_to": "browser", 
+    "click_element": "browser",
+    "add_bookmark": "browser",
+    "get_page_content": "browser",
+    "take_screenshot": "browser",
+    "get_bookmarks": "browser",
+    "send_cli_command": "browser",
+    "check_gui_status": "browser",
+    
+    # Word editor tools
+    "set_text": "word_editor",
+    "append_text": "word_editor",
+    "open_file": "word_editor",
+    "save_file": "word_editor",
+    "create_document": "word_editor",
+    "get_text": "word_editor",
+    "insert_text": "word_editor",
+    "replace_text": "word_editor",
+    "send_cli_command": "word_editor",
+    "check_gui_status": "word_editor",
+    
+    # Radio player tools
+    "play_station": "radio_player",
+    "stop_playback": "radio_player",
+    "pause_playback": "radio_player",
+    "resume_playback": "radio_player",
+    "get_playback_status": "radio_player",
+    "get_current_station": "radio_player",
+    "add_favorite_station": "radio_player",
+    "remove_favorite_station": "radio_player",
+    "list_favorite_stations": "radio_player",
+    "get_station_info": "radio_player",
+    "search_stations": "radio_player",
+    "search_by_genre": "radio_player",
+    "search_by_country": "radio_player",
+    "get_popular_stations": "radio_player",
+    "set_volume": "radio_player",
+    "get_volume": "radio_player",
+    
+    # RAG tools
+    "rag_index_all": "rag",
+    "rag_add_document": "rag",
+    "rag_delete_document": "rag",
+    "rag_query": "rag",
+    "rag_interactive_query": "rag",
+    "rag_start_watching": "rag",
+    "rag_stop_watching": "rag",
+    "rag_health_check": "rag",
+    "rag_get_status": "rag"
+}
+
 
 class ToolCallExecutor:
     """Executes tool calls extracted from RAG responses."""
@@ -188,6 +298,20 @@ class ToolCallExecutor:
             print(f"⚠️  Failed to load tool schemas for server '{server_name}': {e}")
         return None
 
+    def _load_tool_validators(self, server_name: str) -> Optional[Dict[str, Callable[[Dict[str, Any]], Optional[str]]]]:
+        """Return the compiled argument validators for a server's tools.
+
+        The schemas file is executed and compiled once per process; later
+        calls, from this or any other executor instance, reuse the result.
+        """
+        schemas_path = f"{self.base_dir}/MCP/{server_name}/schemas/tool_schemas.py"
+        if schemas_path not in _VALIDATOR_CACHE:
+            schemas = self._load_tool_schemas(server_name)
+            _VALIDATOR_CACHE[schemas_path] = {
+                name: _compile_validator(schema) for name, schema in schemas.items()
+            } if schemas else None
+        return _VALIDATOR_CACHE[schemas_path]
+
     def _validate_tool_call(self, tool_name: str, arguments: Any) -> Optional[str]:
         """Validate tool call arguments against the MCP tool schema.
         Returns None if valid; otherwise returns an error message string.
@@ -218,46 +342,16 @@ class ToolCallExecutor:
         except Exception:
             return f"Cannot determine server for tool: {tool_name}"
 
-        schemas = self._load_tool_schemas(server_name)
-        if not schemas:
+        validators = self._load_tool_validators(server_name)
+        if not validators:
             # If schemas unavailable, skip strict validation but warn
             print(f"⚠️  Schemas not found for server '{server_name}', skipping validation")
             return None
-        schema = schemas.get(tool_name)
-        if not schema:
+        validate = validators.get(tool_name)
+        if not validate:
             return f"Tool '{tool_name}' not found in server '{server_name}' schemas"
 
-        # Check required fields
-        required = schema.get('required', [])
-        missing = [k for k in required if k not in arguments]
-        if missing:
-            return f"Missing required argument(s): {', '.join(missing)}"
-
-        # Basic type checking for provided arguments
-        props: Dict[str, Any] = schema.get('properties', {})
-        type_map = {
-            'string': str,
-            'integer': int,
-            'number': (int, float),
-            'boolean': bool,
-            'object': dict,
-            'array': list,
-        }
-        for key, value in arguments.items():
-            if key in props and 'type' in props[key]:
-                expected = props[key]['type']
-                py_type = type_map.get(expected)
-                if py_type and not isinstance(value, py_type):
-                    return f"Invalid type for '{key}': expected {expected}"
-
-        # additionalProperties: False enforcement
-        if schema.get('additionalProperties') is False:
-            allowed = set(props.keys())
-            extra = [k for k in arguments.keys() if k not in allowed]
-            if extra:
-                return f"Unexpected argument(s): {', '.join(extra)}"
-
-        return None
+        return validate(arguments)
     
     def extract_json_tool_calls(self, text: str) -> List[Dict[str, Any]]:
         """Extract JSON tool calls from text response using robust parsing.
@@ -404,62 +498,7 @@ class ToolCallExecutor:
         Returns:
             Path of the MCP server script that handles this tool, or None if unknown
         """
-        # Tool to server mapping
-        tool_server_map = {
-            # Browser tools
-            "open_url": "browser",
-            "navigate_to": "browser", 
-            "click_element": "browser",
-            "add_bookmark": "browser",
-            "get_page_content": "browser",
-            "take_screenshot": "browser",
-            "get_bookmarks": "browser",
-            "send_cli_command": "browser",
-            "check_gui_status": "browser",
-            
-            # Word editor tools
-            "set_text": "word_editor",
-            "append_text": "word_editor",
-            "open_file": "word_editor",
-            "save_file": "word_editor",
-            "create_document": "word_editor",
-            "get_text": "word_editor",
-            "insert_text": "word_editor",
-            "replace_text": "word_editor",
-            "send_cli_command": "word_editor",
-            "check_gui_status": "word_editor",
-            
-            # Radio player tools
-            "play_station": "radio_player",
-            "stop_playback": "radio_player",
-            "pause_playback": "radio_player",
-            "resume_playback": "radio_player",
-            "get_playback_status": "radio_player",
-            "get_current_station": "radio_player",
-            "add_favorite_station": "radio_player",
-            "remove_favorite_station": "radio_player",
-            "list_favorite_stations": "radio_player",
-            "get_station_info": "radio_player",
-            "search_stations": "radio_player",
-            "search_by_genre": "radio_player",
-            "search_by_country": "radio_player",
-            "get_popular_stations": "radio_player",
-            "set_volume": "radio_player",
-            "get_volume": "radio_player",
-            
-            # RAG tools
-            "rag_index_all": "rag",
-            "rag_add_document": "rag",
-            "rag_delete_document": "rag",
-            "rag_query": "rag",
-            "rag_interactive_query": "rag",
-            "rag_start_watching": "rag",
-            "rag_stop_watching": "rag",
-            "rag_health_check": "rag",
-            "rag_get_status": "rag"
-        }
-        
-        server_name = tool_server_map.get(tool_name)
+        server_name = TOOL_SERVER_MAP.get(tool_name)
         if server_name:
             return self.mcp_servers.get(server_name)
         return None
@@ -15,6 +15,15 @@ try:
 except Exception:  # Fallback if import path changes or class unavailable
     BaseNode = None
 
+# Applied to Chroma's SQLite connection when the client is opened. WAL with
+# synchronous=NORMAL only fsyncs at checkpoints instead of on every commit,
+# which is what bulk indexing writes were waiting on; it stays crash-safe.
+SQLITE_PRAGMAS = (
+    "journal_mode = WAL",
+    "synchronous = NORMAL",
+    "temp_store = MEMORY",
+)
+
 
 class VectorStoreManager:
     """
@@ -39,6 +48,7 @@ class VectorStoreManager:
         self._db = None
         self._chroma_collection = None
         self._vector_store = None
+        self._index = None
         self._settings_configured = False
 
     @property
@@ -46,8 +56,24 @@ class VectorStoreManager:
         """Lazy property for ChromaDB client."""
         if self._db is None:
             self._db = chromadb.PersistentClient(path=self.db_path)
+            self._tune_sqlite(self._db)
         return self._db
 
+    @staticmethod
+    def _tune_sqlite(client):
+        """Set SQLITE_PRAGMAS on the client's SQLite connection.
+
+        Chroma has no public setting for these, so this reaches into its
+        system registry; if that changes, the defaults are simply kept.
+        """
+        try:
+            from chromadb.db.impl.sqlite import SqliteDB
+            conn = client._system.instance(SqliteDB)._conn_pool.connect()
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(f"PRAGMA {pragma}")
+        except Exception as e:
+            print(f"Could not tune ChromaDB SQLite settings: {e}")
+
     @property
     def chroma_collection(self):
         """Lazy property for ChromaDB collection."""
@@ -62,12 +88,35 @@ class VectorStoreManager:
             self._vector_store = ChromaVectorStore(chroma_collection=self.chroma_collection)
         return self._vector_store
 
+    @property
+    def index(self) -> 'VectorStoreIndex':
+        """Lazy property for the index over the existing vector store.
+
+        Add, delete and query all go through this one instance instead of
+        reloading the index from the collection on every operation.
+        """
+        if self._index is None:
+            self._index = self.create_or_load_index()
+        return self._index
+
     def _ensure_settings_configured(self):
         """Ensure Settings.embed_model is configured (only once)."""
         if not self._settings_configured:
             Settings.embed_model = self.embedding_model
             self._settings_configured = True
 
+    def _renew_async_embed_client(self):
+        """Give the embedding model a new async client before a use_async build.
+
+        Each use_async build runs on an event loop of its own, while the
+        Ollama async client keeps its pooled connections from the loop that
+        opened them; reusing those in the next --index of the long-lived
+        worker can fail with "Event loop is closed".
+        """
+        async_client = getattr(self.embedding_model, "_async_client", None)
+        if async_client is not None:
+            self.embedding_model._async_client = type(async_client)(host=self.embedding_model.base_url)
+
     def create_or_load_index(self, documents: Optional[List[Document]] = None) -> 'VectorStoreIndex':
         """
         Creates a new index from documents or loads an existing one from the vector store.
@@ -86,16 +135,23 @@ class VectorStoreManager:
             # Decide based on the type of the first item
             first = documents[0] if len(documents) > 0 else None
 
+            # Embeddings come from the Ollama server, so bulk indexing is
+            # bound by request latency; use_async keeps several embedding
+            # batches in flight instead of sending them one after another
+            self._renew_async_embed_client()
             if first is not None and isinstance(first, Document):
                 # Build index directly from documents using the shared vector store
                 index = VectorStoreIndex.from_documents(
-                    documents, storage_context=storage_context, embed_model=self.embedding_model
+                    documents, storage_context=storage_context, embed_model=self.embedding_model,
+                    use_async=True
                 )
                 print(f"Successfully indexed {len(documents)} document(s).")
             elif BaseNode is not None and first is not None and isinstance(first, BaseNode):
-                # Create/load empty index bound to the vector store, then insert nodes
-                index = VectorStoreIndex.from_vector_store(self.vector_store, embed_model=self.embedding_model)
-                index.insert_nodes(documents)
+                # Build the index from the nodes, writing into the shared vector store
+                index = VectorStoreIndex(
+                    nodes=documents, storage_context=storage_context, embed_model=self.embedding_model,
+                    use_async=True
+                )
                 print(f"Successfully indexed {len(documents)} node(s).")
             else:
                 # Fallback: treat as documents
@@ -106,6 +162,7 @@ class VectorStoreManager:
         else:
             index = VectorStoreIndex.from_vector_store(self.vector_store, embed_model=self.embedding_model)
             print("Loaded existing index.")
+        self._index = index
         return index
 
     def add_documents(self, documents: List[Document]):
@@ -115,7 +172,7 @@ class VectorStoreManager:
         Args:
             documents (List[Document]): A list of new documents or nodes to add.
         """
-        index = self.create_or_load_index()
+        index = self.index
 
         if len(documents) == 0:
             print("No documents provided to add.")
@@ -154,12 +211,11 @@ class VectorStoreManager:
         Args:
             file_paths (List[str]): A list of file paths to delete from the index.
         """
-        index = self.create_or_load_index()
-        
         for file_path in file_paths:
             try:
-                # Try to delete by document ID (file path)
-                index.delete_ref_doc(file_path, delete_from_docstore=True)
+                # Documents get random IDs when they are read, so match the
+                # file_path the reader stored in every node's metadata
+                self.chroma_collection.delete(where={"file_path": file_path})
                 print(f"Successfully deleted document: {file_path}")
             except Exception as e:
                 print(f"Error deleting document {file_path}: {e}")
\ No newline at end of file
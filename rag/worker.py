@@ -0,0 +1,112 @@
+"""Long-lived runner for RAG command-line operations.
+
+Reads one JSON request per line on stdin, ``{"argv": [...]}``, runs
+``main.main(argv)`` in-process and writes one JSON line back:
+``{"returncode": int, "stdout": str, "stderr": str, "result": ...}``, where
+``result`` is whatever main() returned (the structured answer for --query). The Ollama models,
+the Chroma client and the query pipeline are set up by the first command
+that needs them and reused by every later one, so callers such as the RAG
+MCP server don't pay interpreter startup, imports and model loading per
+operation.
+
+``--watch`` never returns and is not accepted here; run it through main.py.
+
+Run with: python worker.py (from the rag directory)
+"""
+
+import io
+import json
+import os
+import sys
+import traceback
+from collections import deque
+from contextlib import redirect_stderr, redirect_stdout
+
+import main as rag_main
+
+# Indexing, adding and deleting print a line or more per file and node;
+# only the last lines of that progress log are sent back
+TAIL_LINES = 1000
+TAIL_COMMANDS = {"--index", "--add", "--delete"}
+
+
+class TailBuffer(io.TextIOBase):
+    """Write-only text stream that keeps just its last ``maxlen`` lines."""
+
+    def __init__(self, maxlen=TAIL_LINES):
+        self._lines = deque(maxlen=maxlen)
+        self._partial = ""
+        self._dropped = 0
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(line)
+        return len(text)
+
+    def getvalue(self):
+        lines = list(self._lines)
+        if self._dropped:
+            lines.insert(0, f"... {self._dropped} earlier lines omitted")
+        if self._partial:
+            lines.append(self._partial)
+            return "\n".join(lines)
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def run_command(argv):
+    """Run one RAG command, returning (returncode, stdout, stderr, result)."""
+    if "--watch" in argv:
+        return 2, "", "--watch is not supported by the worker; run main.py --watch", None
+
+    # Query answers are returned whole; progress logs only as a bounded tail
+    out = TailBuffer() if TAIL_COMMANDS.intersection(argv) else io.StringIO()
+    err = io.StringIO()
+    returncode = 0
+    result = None
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            result = rag_main.main(argv)
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                returncode = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return returncode, out.getvalue(), err.getvalue(), result
+
+
+def main():
+    # Keep the real stdout for replies and point fd 1 at stderr, so output
+    # written below Python's sys.stdout (native libraries) can't corrupt them
+    reply = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        try:
+            argv = json.loads(line)["argv"]
+            returncode, stdout, stderr, result = run_command([str(a) for a in argv])
+        except (ValueError, KeyError, TypeError) as e:
+            returncode, stdout, stderr, result = 2, "", f"Invalid request: {e}", None
+        reply.write(json.dumps({
+            "returncode": returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "result": result,
+        }, default=str).encode('utf-8') + b"\n")
+        reply.flush()
+
+
+if __name__ == "__main__":
+    main()
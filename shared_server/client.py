@@ -1,11 +1,37 @@
 """Client utilities for connecting to the shared server."""
 
+import asyncio
 import json
 import socket
 from pathlib import Path
 from typing import Dict, Any, Optional
 import tempfile
 
+try:
+    # Optional: works on bytes directly and is much faster than json
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+
+def _encode_line(obj: Any) -> bytes:
+    """Encode ``obj`` as one newline-terminated JSON line."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # e.g. values orjson can't serialize; let json decide
+    return (json.dumps(obj) + '\n').encode('utf-8')
+
+# Environment variable carrying the write end of a launcher's readiness pipe
+READY_FD_ENV = 'WALLS_READY_FD'
+
+# Replies can carry whole page HTML, so allow long lines and read in big chunks
+MAX_RESPONSE_SIZE = 64 * 1024 * 1024
+RECV_SIZE = 64 * 1024
+
 
 class ServerClient:
     """Client for communicating with the shared server."""
@@ -59,22 +85,25 @@ class ServerClient:
                     'cmd': command,
                     'args': args or {}
                 }
-                message = json.dumps(command_data) + '\n'
-                sock.sendall(message.encode('utf-8'))
+                sock.sendall(_encode_line(command_data))
                 
                 # Receive response
-                response_data = b''
-                while b'\n' not in response_data:
-                    chunk = sock.recv(4096)
+                # Collect chunks and only scan each new one for the newline, so
+                # large replies aren't re-copied and re-scanned on every recv
+                chunks = []
+                while True:
+                    chunk = sock.recv(RECV_SIZE)
                     if not chunk:
                         break
-                    response_data += chunk
+                    chunks.append(chunk)
+                    if b'\n' in chunk:
+                        break
+                response_data = b''.join(chunks)
                     
                 if not response_data:
                     raise RuntimeError("No response received from server")
                     
-                response_str = response_data.decode('utf-8').strip()
-                return json.loads(response_str)
+                return _loads(response_data)
                 
         except socket.error as e:
             raise ConnectionError(f"Failed to connect to {self.app_name} server on port {port}: {e}")
@@ -91,6 +120,132 @@ class ServerClient:
             return False
 
 
+class AsyncServerClient:
+    """Asyncio client that keeps one connection open to an app server.
+    
+    Commands are sent as newline-delimited JSON over a single long-lived
+    connection, so callers in an event loop avoid spawning the CLI and
+    reconnecting for every command. Commands are serialized per client.
+    """
+    
+    def __init__(self, app_name: str, host: str = '127.0.0.1', timeout: float = 5.0):
+        self.app_name = app_name
+        self.host = host
+        self.timeout = timeout
+        self._port_client = ServerClient(app_name, host, timeout)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        
+    async def _connect(self):
+        """Open a new connection to the app server."""
+        port = self._port_client.get_app_port()
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, port, limit=MAX_RESPONSE_SIZE),
+                timeout=self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ConnectionError(f"Failed to connect to {self.app_name} server on port {port}: {e}")
+            
+    def _close(self):
+        """Drop the current connection; the next command reconnects lazily."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+        
+    async def send_command(self, command: str, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a command to the app server.
+        
+        Args:
+            command: The command to send
+            args: Optional arguments for the command
+            
+        Returns:
+            Response dictionary from the server
+            
+        Raises:
+            ConnectionError: If unable to connect to server
+            RuntimeError: If communication fails
+        """
+        async with self._lock:
+            # The server closes idle connections; reconnect if that happened
+            reused = self._writer is not None and not self._reader.at_eof()
+            if not reused:
+                self._close()
+                await self._connect()
+                
+            command_data = {
+                'cmd': command,
+                'args': args or {}
+            }
+            message = _encode_line(command_data)
+            
+            while True:
+                try:
+                    self._writer.write(message)
+                    await self._writer.drain()
+                    response_data = await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+                except asyncio.TimeoutError as e:
+                    # The command may be running; resending could run it twice
+                    self._close()
+                    raise ConnectionError(f"Lost connection to {self.app_name} server: {e}")
+                except OSError as e:
+                    self._close()
+                    if reused:
+                        # Closed by the server's idle timeout while we wrote;
+                        # no reply arrived, so send again on a new connection
+                        reused = False
+                        await self._connect()
+                        continue
+                    raise ConnectionError(f"Lost connection to {self.app_name} server: {e}")
+                except ValueError as e:
+                    # Reply longer than MAX_RESPONSE_SIZE; the rest of it is unread
+                    self._close()
+                    raise RuntimeError(f"Response from {self.app_name} server too large: {e}")
+                except asyncio.CancelledError:
+                    # A reply may still be in flight; drop the connection so the
+                    # next command doesn't read it as its own
+                    self._close()
+                    raise
+                    
+                if not response_data:
+                    self._close()
+                    if reused:
+                        # Same idle-timeout race, seen as EOF before any reply
+                        reused = False
+                        await self._connect()
+                        continue
+                    raise RuntimeError("No response received from server")
+                break
+                
+            try:
+                return _loads(response_data)
+            except json.JSONDecodeError as e:
+                self._close()
+                raise RuntimeError(f"Invalid response from server: {e}")
+
+
+# Shared async clients, one per app
+_async_clients: Dict[str, AsyncServerClient] = {}
+
+
+def get_async_client(app_name: str) -> AsyncServerClient:
+    """Get the shared async client for an app.
+    
+    Args:
+        app_name: Name of the target application
+        
+    Returns:
+        AsyncServerClient bound to the application
+    """
+    client = _async_clients.get(app_name)
+    if client is None:
+        client = _async_clients[app_name] = AsyncServerClient(app_name)
+    return client
+
+
 def send_command_to_app(app_name: str, command: str, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Convenience function to send a command to an app.
     
@@ -5,6 +5,7 @@ and receive CLI commands through a unified interface.
 """
 
 import json
+import os
 import socket
 import threading
 import time
@@ -14,9 +15,41 @@ from dataclasses import dataclass
 import tempfile
 import logging
 
+try:
+    # Optional: much faster than json for large replies such as page HTML
+    import orjson
+except ImportError:
+    orjson = None
+
+from .client import READY_FD_ENV
 from .config import ServerConfig, get_config
 from .mcp_manager import MCPManager
 
+# Readiness pipe handed down by MCP/app_launcher.py, popped so that processes
+# spawned from here don't inherit it.
+_ready_fd: Optional[int] = None
+try:
+    _ready_fd = int(os.environ.pop(READY_FD_ENV))
+except (KeyError, ValueError):
+    pass
+
+
+def _notify_ready():
+    """Tell the launching process that an app server is accepting connections."""
+    global _ready_fd
+    fd, _ready_fd = _ready_fd, None
+    if fd is None:
+        return
+    try:
+        os.write(fd, b'1')
+    except OSError:
+        pass
+    finally:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
 
 @dataclass
 class AppRegistration:
@@ -239,6 +272,7 @@ class SharedServer:
                 server_sock.settimeout(1.0)  # Allow periodic checks for shutdown
                 
                 self.logger.info(f"App server for '{app.name}' listening on port {app.port}")
+                _notify_ready()
                 
                 while self.running and app.active:
                     try:
@@ -267,55 +301,76 @@ class SharedServer:
         thread.start()
         
     def _handle_client(self, client_sock: socket.socket, app: AppRegistration):
-        """Handle a client connection for a specific app."""
+        """Handle a client connection for a specific app.
+        
+        A connection may carry several newline-delimited commands; each one
+        gets its own response line. After the first command the connection
+        is kept open until the client closes it or it stays idle for the
+        configured server timeout.
+        """
         try:
             with client_sock:
                 client_sock.settimeout(5.0)
                 
-                # Read the command
                 data = b""
-                try:
-                    while True:
+                served = False
+                while self.running and app.active:
+                    # Read until at least one complete command is buffered
+                    try:
                         chunk = client_sock.recv(4096)
-                        if not chunk:
-                            break
-                        data += chunk
-                        if b"\n" in chunk:
-                            break
-                except socket.timeout:
-                    self.logger.warning(f"Timeout receiving data from client for {app.name}")
-                    return
-
-                    
-                if not data:
-                    return
-                    
-                # Parse command
-                try:
-                    command_str = data.decode('utf-8').strip()
-                    command_data = json.loads(command_str)
-                    
-                    cmd = command_data.get('cmd') or command_data.get('command')
-                    args = command_data.get('args') or command_data.get('data', {})
-                    
-                    if not cmd:
-                        response = {'status': 'error', 'message': 'No command specified'}
-                    else:
-                        # Call the app's command handler
-                        response = app.command_handler(cmd, args)
+                    except socket.timeout:
+                        if not served:
+                            self.logger.warning(f"Timeout receiving data from client for {app.name}")
+                        return
                         
-                except json.JSONDecodeError as e:
-                    response = {'status': 'error', 'message': f'Invalid JSON: {e}'}
-                except Exception as e:
-                    response = {'status': 'error', 'message': f'Command error: {e}'}
-                    
-                # Send response
-                response_str = json.dumps(response) + "\n"
-                client_sock.sendall(response_str.encode('utf-8'))
+                    if not chunk:
+                        # Client closed; handle a trailing command without newline
+                        if data.strip():
+                            client_sock.sendall(self._process_command(data, app))
+                        return
+                        
+                    data += chunk
+                    while b"\n" in data:
+                        line, data = data.split(b"\n", 1)
+                        if not line.strip():
+                            continue
+                        client_sock.sendall(self._process_command(line, app))
+                        if not served:
+                            served = True
+                            client_sock.settimeout(self.config.get_timeout())
                 
         except Exception as e:
             self.logger.error(f"Error handling client for {app.name}: {e}")
             
+    def _process_command(self, data: bytes, app: AppRegistration) -> bytes:
+        """Run one encoded command through the app's handler and encode the response."""
+        try:
+            command_data = json.loads(data)
+            
+            cmd = command_data.get('cmd') or command_data.get('command')
+            args = command_data.get('args') or command_data.get('data', {})
+            
+            if not cmd:
+                response = {'status': 'error', 'message': 'No command specified'}
+            else:
+                # Call the app's command handler
+                response = app.command_handler(cmd, args)
+                
+        except json.JSONDecodeError as e:
+            response = {'status': 'error', 'message': f'Invalid JSON: {e}'}
+        except Exception as e:
+            response = {'status': 'error', 'message': f'Command error: {e}'}
+            
+        if orjson is not None:
+            try:
+                return orjson.dumps(response, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+            except TypeError:
+                pass  # e.g. values orjson can't serialize; let json decide
+        # Keep non-ASCII text as UTF-8 rather than \uXXXX escapes, which can
+        # inflate non-Latin page HTML several times over
+        response_str = json.dumps(response, ensure_ascii=False) + "\n"
+        return response_str.encode('utf-8', 'replace')  # lone surrogates become '?'
+            
     def _is_port_in_use(self, port: int) -> bool:
         """Check if a port is already in use."""
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s: